@@ -83,8 +83,9 @@ def main():
         NoTradeFilterStrategy(min_btc_volatility=50.0, max_spread=0.10, lookback_minutes=30, max_position_pct=config.max_position_pct)
     ]
     
-    # Run simulations
+    # Run simulations; metrics are calculated once per strategy and reused below
     all_results = []
+    all_metrics = []
     
     print(f"\nRunning simulations for {len(strategies)} strategies...")
     print("-" * 60)
@@ -94,10 +95,11 @@ def main():
         
         try:
             results = simulator.run(strategy)
-            all_results.append(results)
             
             # Calculate and print metrics
             metrics = MetricsCalculator.calculate_metrics(results)
+            all_results.append(results)
+            all_metrics.append(metrics)
             MetricsCalculator.print_metrics(metrics)
             
             # Generate and print explainability report
@@ -120,12 +122,12 @@ def main():
                 
                 losing_hours = [h for h in results['hours_traded'] if h['hour_pnl'] < 0]
                 if losing_hours:
-                    for hour_result in losing_hours[:3]:  # Show first 3 losing hours
-                        hourly_report = explainability.generate_hourly_report(
-                            hour_result=hour_result,
-                            portfolio=portfolio,
-                            strategy=strategy
-                        )
+                    hourly_reports = explainability.generate_hourly_reports(
+                        hour_results=losing_hours[:3],  # Show first 3 losing hours
+                        portfolio=portfolio,
+                        strategy=strategy
+                    )
+                    for hourly_report in hourly_reports:
                         print(hourly_report)
                 else:
                     print("\n✓ No losing hours to diagnose!\n")
@@ -145,7 +147,7 @@ def main():
         print("Strategy Comparison")
         print("=" * 60)
         
-        comparison = MetricsCalculator.create_comparison_table(all_results)
+        comparison = MetricsCalculator.create_comparison_table(all_results, metrics_list=all_metrics)
         print(comparison.to_string(index=False))
         print()
         
@@ -156,10 +158,11 @@ def main():
         StrategyVisualizer.create_alpha_comparison_charts(
             all_results=all_results,
             baseline_name="NoTrade",
-            output_dir="output"
+            output_dir="output",
+            metrics_list=all_metrics
         )
         # Print strategy leaderboard
-        MetricsCalculator.print_strategy_leaderboard(all_results)
+        MetricsCalculator.print_strategy_leaderboard(all_results, metrics_list=all_metrics)
         
         # Print hour-by-hour breakdown for top strategy (highest PnL)
         if len(all_results) > 0:
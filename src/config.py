@@ -31,6 +31,7 @@ class SimulationConfig:
     btc_prices_path: str = "data/btc_prices_minute.csv"
     markets_path: str = "data/kalshi_markets.csv"
     contract_prices_path: str = "data/kalshi_contract_prices.csv"
+    metrics_cache_dir: Optional[str] = None  # Persist market selection metrics here (None: off)
     
     # Simulation parameters
     start_date: Optional[str] = None  # YYYY-MM-DD format
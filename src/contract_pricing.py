@@ -102,7 +102,7 @@ class ContractPricer:
         """
         # Filter prices for this hour
         mask = (btc_prices.index >= hour_start) & (btc_prices.index < hour_end)
-        hour_prices = btc_prices[mask].copy()
+        hour_prices = btc_prices[mask]
         
         if hour_prices.empty:
             return pd.DataFrame(columns=['timestamp', 'yes_price', 'no_price'])
@@ -98,7 +98,7 @@ def _append_csv(df: pd.DataFrame, path: Path, dedup_cols: Iterable[str], sort_co
         existing = pd.read_csv(path)
         combined = pd.concat([existing, df], ignore_index=True)
     else:
-        combined = df.copy()
+        combined = df
 
     combined = combined.drop_duplicates(subset=list(dedup_cols), keep="last")
     combined = combined.sort_values(list(sort_cols))
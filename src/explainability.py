@@ -8,11 +8,16 @@ This module provides:
 - Diagnostic reports generation
 """
 
+import functools
+import math
+import io
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
+from .numba_compat import NUMBA_AVAILABLE, njit, prange
+from .time_utils import NAT_NS, datetime_ns
 
 # Constants for analysis thresholds
 FAIR_VALUE_PRICE = 0.5  # Fair value for binary contracts
@@ -24,10 +29,40 @@ MEDIUM_MISS_THRESHOLD = 100  # USD distance from strike for "medium miss"
 
 # Display constants
 BAR_CHART_LENGTH = 30  # Character length for visual bar charts
+SEP70 = '=' * 70  # Report section separator
+DASH70 = '-' * 70  # Report sub-section separator
+RULE70 = '─' * 70  # Report total rule
+# Pre-rendered importance bars, indexed by filled length
+BARS = tuple('█' * i + '░' * (BAR_CHART_LENGTH - i) for i in range(BAR_CHART_LENGTH + 1))
 EPSILON = 1e-6  # Small value for numerical stability
 
+# Below this many losing trades the NumPy classifier beats JIT dispatch
+JIT_MIN_TRADES = 10_000
 
-@dataclass
+# Failure reasons, indexed by the int8 codes produced by _classify_all
+REASON_LARGE_MISS = 0
+REASON_MEDIUM_MISS = 1
+REASON_CLOSE_CALL = 2
+REASON_YES_INCONSISTENT = 3
+REASON_NO_INCONSISTENT = 4
+REASON_EXPENSIVE_ENTRY = 5
+REASON_ABOVE_FAIR_VALUE = 6
+REASON_MOVED_AGAINST = 7
+
+REASON_NAMES = (
+    "Wrong direction (large miss)",
+    "Wrong direction (medium miss)",
+    "Wrong direction (close call)",
+    "Data inconsistency (YES lost but BTC >= strike)",
+    "Data inconsistency (NO lost but BTC < strike)",
+    "Expensive entry (low reward/risk)",
+    "Above fair value entry",
+    "Market moved against position",
+)
+NUM_REASONS = len(REASON_NAMES)
+
+
+@dataclass(slots=True)
 class TradeAttribution:
     """Attribution of PnL to different components."""
     entry_pnl: float  # PnL from entry price selection
@@ -45,7 +80,7 @@ class TradeAttribution:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class FailureCase:
     """Represents a losing trade with context."""
     timestamp: pd.Timestamp
@@ -59,6 +94,256 @@ class FailureCase:
     failure_reason: Optional[str] = None
 
 
+@dataclass(slots=True)
+class ReportData:
+    """Numeric results behind the summary report, before any formatting."""
+    strategy_name: str
+    feature_importance: Dict[str, float]
+    attributions: Dict
+    failure_summary: List[Tuple[str, int, float]]  # (reason, count, total_loss), most common first
+    num_failures: int
+    total_pnl: Optional[float]  # Only read from results when there are trades
+    insights: List[str]
+
+
+def _entry_price_bucket(entry_price: float) -> int:
+    """Bucket an entry price: 2 = expensive, 1 = above fair value, 0 = otherwise."""
+    if entry_price > EXPENSIVE_ENTRY_THRESHOLD:
+        return 2
+    elif entry_price > FAIR_VALUE_PRICE:
+        return 1
+    return 0
+
+
+def _distance_bucket(final_btc: float, strike: float) -> int:
+    """
+    Bucket the signed distance between final BTC price and strike.
+    
+    Returns +/-1 (close call), +/-2 (medium miss) or +/-3 (large miss); the sign
+    is positive when final_btc >= strike. Returns 0 if the prices cannot be
+    ordered (missing data).
+    """
+    distance = abs(final_btc - strike)
+    if distance > LARGE_MISS_THRESHOLD:
+        level = 3
+    elif distance > MEDIUM_MISS_THRESHOLD:
+        level = 2
+    else:
+        level = 1
+    if final_btc >= strike:
+        return level
+    elif final_btc < strike:
+        return -level
+    return 0
+
+
+@functools.lru_cache(maxsize=None)
+def _classify_key(is_yes: bool, entry_price_bucket: int, distance_bucket: Optional[int]) -> str:
+    """
+    Map a bucketed trade to its failure reason.
+    
+    Args:
+        is_yes: True for YES contracts, False for NO
+        entry_price_bucket: Result of _entry_price_bucket
+        distance_bucket: Result of _distance_bucket, or None without outcome data
+        
+    Returns:
+        String describing failure reason
+    """
+    if distance_bucket is not None:
+        if is_yes:
+            # YES lost, meaning BTC < strike
+            if distance_bucket >= 0:
+                # Data inconsistency: YES lost but final_btc >= strike
+                return REASON_NAMES[REASON_YES_INCONSISTENT]
+        else:
+            # NO lost, meaning BTC >= strike
+            if distance_bucket <= 0:
+                # Data inconsistency: NO lost but final_btc < strike
+                return REASON_NAMES[REASON_NO_INCONSISTENT]
+        
+        level = abs(distance_bucket)
+        if level == 3:
+            return REASON_NAMES[REASON_LARGE_MISS]
+        elif level == 2:
+            return REASON_NAMES[REASON_MEDIUM_MISS]
+        else:
+            return REASON_NAMES[REASON_CLOSE_CALL]
+    
+    # Price-based classification
+    if entry_price_bucket == 2:
+        return REASON_NAMES[REASON_EXPENSIVE_ENTRY]
+    elif entry_price_bucket == 1:
+        return REASON_NAMES[REASON_ABOVE_FAIR_VALUE]
+    else:
+        return REASON_NAMES[REASON_MOVED_AGAINST]
+
+
+@njit(cache=True, parallel=True)
+def _classify_all_numba(entry_price, contract_is_yes, final_btc, strike, out_reason_idx):
+    """Numba kernel behind _classify_all; writes one reason code per trade."""
+    for i in prange(entry_price.shape[0]):
+        distance = abs(final_btc[i] - strike[i])
+        if contract_is_yes[i] and not final_btc[i] < strike[i]:
+            out_reason_idx[i] = REASON_YES_INCONSISTENT
+        elif not contract_is_yes[i] and not final_btc[i] >= strike[i]:
+            out_reason_idx[i] = REASON_NO_INCONSISTENT
+        elif distance > LARGE_MISS_THRESHOLD:
+            out_reason_idx[i] = REASON_LARGE_MISS
+        elif distance > MEDIUM_MISS_THRESHOLD:
+            out_reason_idx[i] = REASON_MEDIUM_MISS
+        else:
+            out_reason_idx[i] = REASON_CLOSE_CALL
+
+
+def _classify_all_numpy(entry_price: np.ndarray,
+                        contract_is_yes: np.ndarray,
+                        final_btc: Optional[np.ndarray],
+                        strike: Optional[np.ndarray]) -> np.ndarray:
+    """Vectorized NumPy classifier; see _classify_all."""
+    if final_btc is None or strike is None:
+        # Price-based classification
+        codes = np.full(entry_price.shape, REASON_MOVED_AGAINST, dtype=np.int8)
+        codes[entry_price > FAIR_VALUE_PRICE] = REASON_ABOVE_FAIR_VALUE
+        codes[entry_price > EXPENSIVE_ENTRY_THRESHOLD] = REASON_EXPENSIVE_ENTRY
+        return codes
+    
+    distance = np.abs(final_btc - strike)
+    codes = np.full(entry_price.shape, REASON_CLOSE_CALL, dtype=np.int8)
+    codes[distance > MEDIUM_MISS_THRESHOLD] = REASON_MEDIUM_MISS
+    codes[distance > LARGE_MISS_THRESHOLD] = REASON_LARGE_MISS
+    codes[contract_is_yes & ~(final_btc < strike)] = REASON_YES_INCONSISTENT
+    codes[~contract_is_yes & ~(final_btc >= strike)] = REASON_NO_INCONSISTENT
+    return codes
+
+
+def _classify_all(entry_price: np.ndarray,
+                  contract_is_yes: np.ndarray,
+                  final_btc: Optional[np.ndarray] = None,
+                  strike: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Classify many losing trades at once.
+    
+    Produces the same reasons as _classify_failure, as int8 codes into
+    REASON_NAMES. Uses the Numba kernel for large inputs when Numba is
+    installed, otherwise the NumPy implementation.
+    
+    Args:
+        entry_price: Entry prices
+        contract_is_yes: True for YES contracts, False for NO
+        final_btc: Final BTC prices, or None without outcome data
+        strike: Strike prices, or None without outcome data
+        
+    Returns:
+        Array of int8 reason codes
+    """
+    if (NUMBA_AVAILABLE and final_btc is not None and strike is not None
+            and len(entry_price) >= JIT_MIN_TRADES):
+        codes = np.empty(len(entry_price), dtype=np.int8)
+        _classify_all_numba(
+            np.ascontiguousarray(entry_price, dtype=np.float64),
+            np.ascontiguousarray(contract_is_yes, dtype=np.bool_),
+            np.ascontiguousarray(final_btc, dtype=np.float64),
+            np.ascontiguousarray(strike, dtype=np.float64),
+            codes
+        )
+        return codes
+    return _classify_all_numpy(entry_price, contract_is_yes, final_btc, strike)
+
+
+def _pearson_correlation(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Pearson correlation of two equal-length float arrays.
+    
+    Computes the centered cross and sum-of-squares terms directly instead of
+    building the 2x2 matrix np.corrcoef would.
+    
+    Returns:
+        Correlation clipped to [-1, 1], or 0.0 if either input has a variance
+        of at most EPSILON (or is empty)
+    """
+    n = len(x)
+    if n == 0:
+        return 0.0
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = np.einsum('i,i->', dx, dx)
+    syy = np.einsum('i,i->', dy, dy)
+    if not (sxx > EPSILON * n and syy > EPSILON * n):
+        return 0.0
+    corr = np.einsum('i,i->', dx, dy) / np.sqrt(sxx * syy)
+    return float(min(1.0, max(-1.0, corr)))
+
+
+@njit(cache=True)
+def _importance_kernel(entry_price, pnl, quantity, final_btc, strike, entry_ns, is_yes, has_outcome):
+    """Fused single pass behind ExplainabilityEngine._importance_fused."""
+    win_count = 0
+    win_entry_sum = 0.0
+    lose_count = 0
+    lose_entry_sum = 0.0
+    direction_hits = 0
+    qty_count = 0
+    qty_mean = 0.0
+    qty_m2 = 0.0
+    timing_count = 0
+    time_origin = 0
+    time_mean = 0.0
+    pnl_mean = 0.0
+    time_m2 = 0.0
+    pnl_m2 = 0.0
+    co_moment = 0.0
+    
+    for i in range(pnl.shape[0]):
+        trade_pnl = pnl[i]
+        if trade_pnl > 0:
+            win_count += 1
+            win_entry_sum += entry_price[i]
+        elif trade_pnl < 0:
+            lose_count += 1
+            lose_entry_sum += entry_price[i]
+        
+        if (final_btc[i] >= strike[i]) == is_yes[i]:
+            direction_hits += 1
+        
+        qty = quantity[i]
+        if not np.isnan(qty):
+            qty_count += 1
+            delta = qty - qty_mean
+            qty_mean += delta / qty_count
+            qty_m2 += delta * (qty - qty_mean)
+        
+        if entry_ns[i] != NAT_NS and not np.isnan(trade_pnl):
+            if timing_count == 0:
+                time_origin = entry_ns[i]
+            t = float(entry_ns[i] - time_origin)
+            timing_count += 1
+            dt = t - time_mean
+            time_mean += dt / timing_count
+            dp = trade_pnl - pnl_mean
+            pnl_mean += dp / timing_count
+            time_m2 += dt * (t - time_mean)
+            pnl_m2 += dp * (trade_pnl - pnl_mean)
+            co_moment += dt * (trade_pnl - pnl_mean)
+    
+    entry_quality = 0.0
+    if win_count > 0 and lose_count > 0:
+        entry_quality = abs(win_entry_sum / win_count - lose_entry_sum / lose_count)
+    
+    direction = direction_hits / pnl.shape[0] if has_outcome else 0.0
+    
+    timing = 0.0
+    if timing_count > 1 and time_m2 > 0 and pnl_m2 > 0:
+        timing = min(1.0, abs(co_moment) / np.sqrt(time_m2 * pnl_m2))
+    
+    sizing = 0.0
+    if qty_count > 0:
+        qty_std = np.sqrt(qty_m2 / (qty_count - 1)) if qty_count > 1 else 0.0
+        sizing = 1.0 / (1.0 + qty_std / (qty_mean + EPSILON))
+    
+    return entry_quality, direction, timing, sizing
+
+
 class ExplainabilityEngine:
     """
     Engine for analyzing and explaining strategy performance.
@@ -75,6 +360,65 @@ class ExplainabilityEngine:
         self.trade_attributions = []
         self.failure_cases = []
         
+        # Columnar copy of portfolio.pnl_history, extended as trades are appended
+        self._cache: Dict[str, np.ndarray] = {}
+        self._cache_source = None
+        self._cache_len = 0
+        # Trades grouped by resolution timestamp (hour_end) for hourly reports
+        self._trades_by_ts: Dict[pd.Timestamp, List[Dict]] = defaultdict(list)
+        
+        # Reason codes and PnL of the cases in failure_cases
+        self._failure_codes = np.empty(0, dtype=np.int8)
+        self._failure_pnl = np.empty(0, dtype=np.float64)
+        
+    def _sync_cache(self, portfolio: 'Portfolio') -> None:
+        """
+        Bring the columnar trade cache up to date with portfolio.pnl_history.
+        
+        pnl_history is append-only, so only trades added since the last call
+        are converted. Switching to a different portfolio rebuilds the cache.
+        
+        Args:
+            portfolio: Portfolio with pnl_history
+        """
+        history = portfolio.pnl_history
+        if history is not self._cache_source or len(history) < self._cache_len:
+            self._cache_source = history
+            self._cache_len = 0
+            self._trades_by_ts = defaultdict(list)
+            self._cache = {
+                'pnl': np.empty(0, dtype=np.float64),
+                'entry_price': np.empty(0, dtype=np.float64),
+                'quantity': np.empty(0, dtype=np.float64),
+                'final_btc_price': np.empty(0, dtype=np.float64),
+                'strike_price': np.empty(0, dtype=np.float64),
+                'is_yes': np.empty(0, dtype=bool),
+                'entry_ns': np.empty(0, dtype=np.int64)
+            }
+        
+        start = self._cache_len
+        new_trades = history[start:]
+        if not new_trades:
+            return
+        
+        count = len(new_trades)
+        new_columns = {
+            name: history.array(name, start)
+            for name in ('pnl', 'entry_price', 'quantity', 'final_btc_price', 'strike_price')
+        }
+        # Stored as bool so direction checks never compare strings
+        new_columns['is_yes'] = np.fromiter(
+            (contract_type == 'YES' for contract_type in history.column('contract_type')[start:]),
+            dtype=bool, count=count
+        )
+        # Parsed once here; NaT is stored as NAT_NS
+        new_columns['entry_ns'] = datetime_ns(history.column('entry_time')[start:], errors='coerce')
+        for name, values in new_columns.items():
+            self._cache[name] = np.concatenate((self._cache[name], values))
+        for trade in new_trades:
+            self._trades_by_ts[trade['timestamp']].append(trade)
+        self._cache_len = len(history)
+        
     def calculate_feature_importance(self, 
                                      portfolio: 'Portfolio',
                                      strategy: 'Strategy') -> Dict[str, float]:
@@ -91,57 +435,75 @@ class ExplainabilityEngine:
         Returns:
             Dictionary mapping feature names to importance scores (0-1)
         """
-        if not portfolio.pnl_history:
+        self._sync_cache(portfolio)
+        if self._cache_len == 0:
             return {}
         
-        pnl_df = pd.DataFrame(portfolio.pnl_history)
-        
         # Calculate importance scores based on correlation with PnL
+        if NUMBA_AVAILABLE and self._cache_len >= JIT_MIN_TRADES:
+            importance = self._importance_fused()
+        else:
+            importance = self._importance_vectorized()
+        
+        # Normalize importance scores to 0-1
+        if importance:
+            max_importance = max(importance.values())
+            if max_importance > 0:
+                importance = {k: v / max_importance for k, v in importance.items()}
+        
+        self.feature_importance = importance
+        return importance
+    
+    def _importance_vectorized(self) -> Dict[str, float]:
+        """
+        Raw (unnormalized) importance scores from the trade cache using NumPy.
+        
+        Returns:
+            Dictionary mapping feature names to raw scores
+        """
         importance = {}
+        pnl = self._cache['pnl']
         
         # Entry price quality (how good was the entry price)
-        if len(pnl_df) > 0:
-            # Lower entry price for YES or NO is better (more upside potential)
-            winning_trades = pnl_df[pnl_df['pnl'] > 0]
-            losing_trades = pnl_df[pnl_df['pnl'] < 0]
+        # Lower entry price for YES or NO is better (more upside potential)
+        entry_price = self._cache['entry_price']
+        pnl_sign = np.sign(pnl)
+        win_mask = pnl_sign > 0
+        lose_mask = pnl_sign < 0
+        
+        # All-winning or all-losing histories skip the masked means entirely
+        if win_mask.any() and lose_mask.any():
+            win_avg_entry = entry_price[win_mask].mean()
+            lose_avg_entry = entry_price[lose_mask].mean()
             
-            if len(winning_trades) > 0 and len(losing_trades) > 0:
-                win_avg_entry = winning_trades['entry_price'].mean()
-                lose_avg_entry = losing_trades['entry_price'].mean()
-                
-                # Importance based on difference in entry prices
-                importance['entry_price_quality'] = abs(win_avg_entry - lose_avg_entry)
-            else:
-                importance['entry_price_quality'] = 0.0
+            # Importance based on difference in entry prices
+            importance['entry_price_quality'] = abs(win_avg_entry - lose_avg_entry)
+        else:
+            importance['entry_price_quality'] = 0.0
         
         # Market direction alignment (did we bet with or against the market?)
-        if len(pnl_df) > 0 and 'final_btc_price' in pnl_df.columns and 'strike_price' in pnl_df.columns:
+        final_btc = self._cache['final_btc_price']
+        strike = self._cache['strike_price']
+        if not (np.isnan(final_btc).all() or np.isnan(strike).all()):
             # Calculate how often we correctly predicted direction
-            pnl_df['btc_above_strike'] = pnl_df['final_btc_price'] >= pnl_df['strike_price']
-            pnl_df['bet_yes'] = pnl_df['contract_type'] == 'YES'
-            pnl_df['correct_direction'] = pnl_df['btc_above_strike'] == pnl_df['bet_yes']
-            
-            direction_accuracy = pnl_df['correct_direction'].mean()
+            btc_above_strike = final_btc >= strike
+            direction_accuracy = (btc_above_strike == self._cache['is_yes']).mean()
             importance['market_direction_alignment'] = direction_accuracy
         else:
             importance['market_direction_alignment'] = 0.0
         
         # Trade timing (entry time during the hour)
-        if len(pnl_df) > 0 and 'entry_time' in pnl_df.columns:
-            # Analyze whether entry time is systematically related to PnL
-            entry_times = pd.to_datetime(pnl_df['entry_time'], errors='coerce')
-            valid_mask = entry_times.notna() & pnl_df['pnl'].notna()
-
-            if valid_mask.sum() > 1 and entry_times[valid_mask].nunique() > 1:
-                # Convert entry times to numeric (nanoseconds since epoch) for correlation
-                entry_numeric = entry_times[valid_mask].view('int64')
-                pnl_values = pnl_df.loc[valid_mask, 'pnl'].astype(float)
-
+        # Analyze whether entry time is systematically related to PnL
+        entry_ns = self._cache['entry_ns']
+        valid_mask = (entry_ns != NAT_NS) & ~np.isnan(pnl)
+        
+        if valid_mask.sum() > 1:
+            # Entry times as nanoseconds since epoch
+            entry_numeric = entry_ns[valid_mask]
+            
+            if (entry_numeric != entry_numeric[0]).any():
                 # Correlation between entry time and PnL as a measure of timing importance
-                corr_matrix = np.corrcoef(entry_numeric, pnl_values)
-                corr = corr_matrix[0, 1] if corr_matrix.shape == (2, 2) else 0.0
-                if np.isnan(corr):
-                    corr = 0.0
+                corr = _pearson_correlation(entry_numeric.astype(np.float64), pnl[valid_mask])
                 importance['trade_timing'] = float(abs(corr))
             else:
                 importance['trade_timing'] = 0.0
@@ -149,23 +511,50 @@ class ExplainabilityEngine:
             importance['trade_timing'] = 0.0
         
         # Position sizing discipline
-        if len(pnl_df) > 0 and 'quantity' in pnl_df.columns:
+        quantity = self._cache['quantity']
+        quantity = quantity[~np.isnan(quantity)]
+        if quantity.size > 0:
             # Consistent position sizing is important
-            quantity_variance = pnl_df['quantity'].std() / (pnl_df['quantity'].mean() + EPSILON)
+            # Sample std from the same mean used below, so the column is
+            # reduced once for the mean rather than once per statistic.
+            # A single trade is trivially consistent (sample std would be NaN)
+            quantity_mean = quantity.mean()
+            quantity_std = 0.0
+            if quantity.size > 1:
+                deviations = quantity - quantity_mean
+                quantity_std = np.sqrt(np.dot(deviations, deviations) / (quantity.size - 1))
+            quantity_variance = quantity_std / (quantity_mean + EPSILON)
             # Lower variance is better (more disciplined)
             importance['position_sizing_discipline'] = 1.0 / (1.0 + quantity_variance)
         else:
             importance['position_sizing_discipline'] = 0.0
         
-        # Normalize importance scores to 0-1
-        if importance:
-            max_importance = max(importance.values())
-            if max_importance > 0:
-                importance = {k: v / max_importance for k, v in importance.items()}
-        
-        self.feature_importance = importance
         return importance
     
+    def _importance_fused(self) -> Dict[str, float]:
+        """
+        Raw importance scores from a single compiled pass over the trade cache.
+        
+        Same scores as _importance_vectorized, with every reduction folded into
+        one loop (Welford updates for the sizing and timing moments).
+        
+        Returns:
+            Dictionary mapping feature names to raw scores
+        """
+        cache = self._cache
+        has_outcome = not (np.isnan(cache['final_btc_price']).all() or np.isnan(cache['strike_price']).all())
+        entry_quality, direction, timing, sizing = _importance_kernel(
+            cache['entry_price'], cache['pnl'], cache['quantity'],
+            cache['final_btc_price'], cache['strike_price'], cache['entry_ns'],
+            cache['is_yes'], has_outcome
+        )
+        return {
+            'entry_price_quality': entry_quality,
+            'market_direction_alignment': direction,
+            'trade_timing': timing,
+            'position_sizing_discipline': sizing
+        }
+    
     def attribute_trade_pnl(self,
                            trade: Dict,
                            market_prices: Optional[List[Dict]] = None) -> TradeAttribution:
@@ -235,16 +624,29 @@ class ExplainabilityEngine:
                 'num_trades': 0
             }
         
-        self.trade_attributions = []
+        self._sync_cache(portfolio)
+        entry_price = self._cache['entry_price']
+        pnl = self._cache['pnl']
         
-        for trade in portfolio.pnl_history:
-            attribution = self.attribute_trade_pnl(trade)
-            self.trade_attributions.append(attribution)
+        # Same decomposition as attribute_trade_pnl, applied to the whole cache
+        entry_quality = np.where(
+            np.abs(entry_price - FAIR_VALUE_PRICE) < EPSILON,
+            0.0,
+            (FAIR_VALUE_PRICE - entry_price) / FAIR_VALUE_PRICE
+        )
+        entry_pnl = entry_quality * np.abs(pnl)
+        exit_pnl = pnl - entry_pnl
+        
+        self.trade_attributions = [
+            TradeAttribution(entry_pnl=entry, drift_pnl=0.0, exit_pnl=exit_, total_pnl=total)
+            for entry, exit_, total in zip(entry_pnl.tolist(), exit_pnl.tolist(), pnl.tolist())
+        ]
         
         # Calculate aggregate statistics
-        total_entry = sum(a.entry_pnl for a in self.trade_attributions)
-        total_drift = sum(a.drift_pnl for a in self.trade_attributions)
-        total_exit = sum(a.exit_pnl for a in self.trade_attributions)
+        # fsum keeps the totals exact regardless of history length
+        total_entry = math.fsum(entry_pnl.tolist())
+        total_drift = 0.0
+        total_exit = math.fsum(exit_pnl.tolist())
         num_trades = len(self.trade_attributions)
         
         return {
@@ -267,22 +669,33 @@ class ExplainabilityEngine:
         Returns:
             List of FailureCase objects
         """
+        self.failure_cases = []
+        self._failure_codes = np.empty(0, dtype=np.int8)
+        self._failure_pnl = np.empty(0, dtype=np.float64)
+        
         if not portfolio.pnl_history:
             return []
         
-        self.failure_cases = []
-        pnl_df = pd.DataFrame(portfolio.pnl_history)
+        pnl_df = portfolio.pnl_history.to_frame()
         
         # Filter to losing trades
         losing_trades = pnl_df[pnl_df['pnl'] < 0]
+        has_outcome = 'final_btc_price' in losing_trades.columns and 'strike_price' in losing_trades.columns
         
-        for _, trade in losing_trades.iterrows():
-            # Determine failure reason
-            failure_reason = self._classify_failure(trade)
-            
+        # Classify all losing trades in one pass
+        reason_codes = _classify_all(
+            losing_trades['entry_price'].to_numpy(dtype=np.float64),
+            (losing_trades['contract_type'] == 'YES').to_numpy(),
+            losing_trades['final_btc_price'].to_numpy(dtype=np.float64) if has_outcome else None,
+            losing_trades['strike_price'].to_numpy(dtype=np.float64) if has_outcome else None
+        )
+        self._failure_codes = reason_codes
+        self._failure_pnl = losing_trades['pnl'].to_numpy(dtype=np.float64)
+        
+        for trade, reason_code in zip(losing_trades.to_dict('records'), reason_codes):
             # Calculate price movement if data available
             price_movement = None
-            if 'final_btc_price' in trade and 'strike_price' in trade:
+            if has_outcome:
                 btc_at_exit = trade['final_btc_price']
                 strike = trade['strike_price']
                 price_movement = btc_at_exit - strike
@@ -295,7 +708,7 @@ class ExplainabilityEngine:
                 pnl=trade['pnl'],
                 btc_price_at_exit=trade.get('final_btc_price'),
                 price_movement=price_movement,
-                failure_reason=failure_reason
+                failure_reason=REASON_NAMES[reason_code]
             )
             
             self.failure_cases.append(failure_case)
@@ -306,54 +719,24 @@ class ExplainabilityEngine:
         """
         Classify the reason for trade failure.
         
+        The branch outcome only depends on a handful of buckets, so the
+        trade is reduced to a small key and the lookup is memoized.
+        
         Args:
             trade: Single trade record
             
         Returns:
             String describing failure reason
         """
-        contract_type = trade['contract_type']
-        entry_price = trade['entry_price']
+        is_yes = trade['contract_type'] == 'YES'
         
         # Check if we have market outcome data
         if 'final_btc_price' in trade and 'strike_price' in trade:
-            final_btc = trade['final_btc_price']
-            strike = trade['strike_price']
-            
-            if contract_type == 'YES':
-                # YES lost, meaning BTC < strike
-                if final_btc < strike:
-                    distance = abs(final_btc - strike)
-                    if distance > LARGE_MISS_THRESHOLD:
-                        return "Wrong direction (large miss)"
-                    elif distance > MEDIUM_MISS_THRESHOLD:
-                        return "Wrong direction (medium miss)"
-                    else:
-                        return "Wrong direction (close call)"
-                else:
-                    # Data inconsistency: YES lost but final_btc >= strike
-                    return "Data inconsistency (YES lost but BTC >= strike)"
-            else:  # NO
-                # NO lost, meaning BTC >= strike
-                if final_btc >= strike:
-                    distance = abs(final_btc - strike)
-                    if distance > LARGE_MISS_THRESHOLD:
-                        return "Wrong direction (large miss)"
-                    elif distance > MEDIUM_MISS_THRESHOLD:
-                        return "Wrong direction (medium miss)"
-                    else:
-                        return "Wrong direction (close call)"
-                else:
-                    # Data inconsistency: NO lost but final_btc < strike
-                    return "Data inconsistency (NO lost but BTC < strike)"
-        
-        # Price-based classification
-        if entry_price > EXPENSIVE_ENTRY_THRESHOLD:
-            return "Expensive entry (low reward/risk)"
-        elif entry_price > FAIR_VALUE_PRICE:
-            return "Above fair value entry"
+            distance_bucket = _distance_bucket(trade['final_btc_price'], trade['strike_price'])
         else:
-            return "Market moved against position"
+            distance_bucket = None
+        
+        return _classify_key(is_yes, _entry_price_bucket(trade['entry_price']), distance_bucket)
     
     def cluster_failures(self) -> Dict[str, List[FailureCase]]:
         """
@@ -362,12 +745,35 @@ class ExplainabilityEngine:
         Returns:
             Dictionary mapping failure reasons to lists of failure cases
         """
-        clusters = defaultdict(list)
+        if len(self._failure_codes) != len(self.failure_cases):
+            # failure_cases was modified outside identify_failure_cases
+            clusters = defaultdict(list)
+            for failure in self.failure_cases:
+                clusters[failure.failure_reason].append(failure)
+            return dict(clusters)
         
-        for failure in self.failure_cases:
-            clusters[failure.failure_reason].append(failure)
+        # Group row indices by reason code in one hash groupby
+        idx_by_reason = pd.Series(self._failure_codes).groupby(self._failure_codes).indices
         
-        return dict(clusters)
+        # Reasons in order of first appearance
+        return {
+            REASON_NAMES[code]: [self.failure_cases[i] for i in idx_by_reason[code]]
+            for code in pd.unique(self._failure_codes)
+        }
+    
+    def _summarize_clusters(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count failure cases and total losses per reason without grouping objects.
+        
+        Use cluster_failures when the individual FailureCase objects are needed.
+        
+        Returns:
+            Tuple of (counts, total_losses), both indexed by reason code
+        """
+        counts = np.bincount(self._failure_codes, minlength=NUM_REASONS)
+        total_losses = np.bincount(self._failure_codes, weights=np.abs(self._failure_pnl),
+                                   minlength=NUM_REASONS)
+        return counts, total_losses
     
     def generate_hourly_report(self,
                               hour_result: Dict,
@@ -383,6 +789,48 @@ class ExplainabilityEngine:
             portfolio: Portfolio state
             strategy: Strategy used
             
+        Returns:
+            String report
+        """
+        return self.generate_hourly_reports([hour_result], portfolio, strategy)[0]
+    
+    def generate_hourly_reports(self,
+                               hour_results: List[Dict],
+                               portfolio: 'Portfolio',
+                               strategy: 'Strategy') -> List[str]:
+        """
+        Generate diagnostic reports for several hours at once.
+        
+        The trade cache is synced once and each hour's trades are looked up
+        by resolution time instead of scanning pnl_history per hour.
+        
+        Args:
+            hour_results: Results from simulating each hour
+            portfolio: Portfolio state
+            strategy: Strategy used
+            
+        Returns:
+            List of string reports, one per hour result
+        """
+        self._sync_cache(portfolio)
+        # Trade timestamp is the resolution time (hour_end), so we need to match exactly
+        return [
+            self._render_hour(hour_result, self._trades_by_ts.get(hour_result['hour_end'], []), strategy)
+            for hour_result in hour_results
+        ]
+    
+    def _render_hour(self,
+                     hour_result: Dict,
+                     hour_trades: List[Dict],
+                     strategy: 'Strategy') -> str:
+        """
+        Format the diagnostic report for one hour.
+        
+        Args:
+            hour_result: Results from simulating one hour
+            hour_trades: pnl_history records resolved at this hour's end
+            strategy: Strategy used
+            
         Returns:
             String report
         """
@@ -390,61 +838,57 @@ class ExplainabilityEngine:
         hour_pnl = hour_result['hour_pnl']
         trades_executed = hour_result['trades_executed']
         
-        report_lines = []
-        report_lines.append(f"\n{'='*70}")
-        report_lines.append(f"Diagnostic Report: Hour {hour_start}")
-        report_lines.append(f"{'='*70}")
-        report_lines.append(f"Strategy: {strategy.name}")
-        report_lines.append(f"Hour PnL: ${hour_pnl:.2f}")
-        report_lines.append(f"Trades Executed: {trades_executed}")
-        report_lines.append(f"Strike Price: ${hour_result['strike_price']:.2f}")
-        report_lines.append(f"BTC Start: ${hour_result['spot_price_start']:.2f}")
-        report_lines.append(f"BTC End: ${hour_result['final_btc_price']:.2f}")
-        report_lines.append(f"")
+        buf = io.StringIO()
+        w = buf.write
+        w(f"\n{SEP70}\n")
+        w(f"Diagnostic Report: Hour {hour_start}\n")
+        w(f"{SEP70}\n")
+        w(f"Strategy: {strategy.name}\n")
+        w(f"Hour PnL: ${hour_pnl:.2f}\n")
+        w(f"Trades Executed: {trades_executed}\n")
+        w(f"Strike Price: ${hour_result['strike_price']:.2f}\n")
+        w(f"BTC Start: ${hour_result['spot_price_start']:.2f}\n")
+        w(f"BTC End: ${hour_result['final_btc_price']:.2f}\n")
+        w("\n")
         
         # Overall outcome
         if hour_pnl > 0:
-            report_lines.append(f"✓ PROFITABLE HOUR (+${hour_pnl:.2f})")
+            w(f"✓ PROFITABLE HOUR (+${hour_pnl:.2f})\n")
         elif hour_pnl < 0:
-            report_lines.append(f"✗ LOSING HOUR (-${abs(hour_pnl):.2f})")
+            w(f"✗ LOSING HOUR (-${abs(hour_pnl):.2f})\n")
         else:
-            report_lines.append(f"○ NO TRADES / BREAK EVEN")
-        report_lines.append(f"")
-        
-        # Get trades for this hour
-        # Trade timestamp is the resolution time (hour_end), so we need to match exactly
-        hour_trades = [t for t in portfolio.pnl_history 
-                      if t['timestamp'] == hour_result['hour_end']]
+            w("○ NO TRADES / BREAK EVEN\n")
+        w("\n")
         
         if hour_trades:
-            report_lines.append(f"Trade Analysis:")
-            report_lines.append(f"-" * 70)
+            w("Trade Analysis:\n")
+            w(f"{DASH70}\n")
             
             for i, trade in enumerate(hour_trades, 1):
                 attribution = self.attribute_trade_pnl(trade)
                 
-                report_lines.append(f"\nTrade #{i}:")
-                report_lines.append(f"  Type: {trade['contract_type']}")
-                report_lines.append(f"  Entry Price: ${trade['entry_price']:.3f}")
-                report_lines.append(f"  Quantity: {trade['quantity']:.0f} contracts")
-                report_lines.append(f"  Outcome: {'WIN' if trade['win'] else 'LOSS'}")
-                report_lines.append(f"  PnL: ${trade['pnl']:.2f}")
-                report_lines.append(f"  ")
-                report_lines.append(f"  PnL Attribution:")
-                report_lines.append(f"    Entry Quality: ${attribution.entry_pnl:+.2f}")
-                report_lines.append(f"    Market Drift: ${attribution.drift_pnl:+.2f}")
-                report_lines.append(f"    Exit/Outcome: ${attribution.exit_pnl:+.2f}")
+                w(f"\nTrade #{i}:\n")
+                w(f"  Type: {trade['contract_type']}\n")
+                w(f"  Entry Price: ${trade['entry_price']:.3f}\n")
+                w(f"  Quantity: {trade['quantity']:.0f} contracts\n")
+                w(f"  Outcome: {'WIN' if trade['win'] else 'LOSS'}\n")
+                w(f"  PnL: ${trade['pnl']:.2f}\n")
+                w("  \n")
+                w("  PnL Attribution:\n")
+                w(f"    Entry Quality: ${attribution.entry_pnl:+.2f}\n")
+                w(f"    Market Drift: ${attribution.drift_pnl:+.2f}\n")
+                w(f"    Exit/Outcome: ${attribution.exit_pnl:+.2f}\n")
                 
                 # Explain why trade won/lost
                 if not trade['win']:
                     failure_reason = self._classify_failure(pd.Series(trade))
-                    report_lines.append(f"  Failure Reason: {failure_reason}")
+                    w(f"  Failure Reason: {failure_reason}\n")
         else:
-            report_lines.append(f"No trades executed this hour.")
+            w("No trades executed this hour.\n")
         
-        report_lines.append(f"\n{'='*70}\n")
+        w(f"\n{SEP70}\n")
         
-        return "\n".join(report_lines)
+        return buf.getvalue()
     
     def generate_summary_report(self, 
                                portfolio: 'Portfolio',
@@ -461,93 +905,138 @@ class ExplainabilityEngine:
         Returns:
             String report
         """
+        return self.render_summary_report(self.compute_report_data(portfolio, strategy, results))
+    
+    def compute_report_data(self,
+                            portfolio: 'Portfolio',
+                            strategy: 'Strategy',
+                            results: Dict) -> ReportData:
+        """
+        Run all analyses for the summary report without formatting anything.
+        
+        Args:
+            portfolio: Portfolio with full history
+            strategy: Strategy used
+            results: Full simulation results
+            
+        Returns:
+            ReportData for render_summary_report or programmatic use
+        """
         # Calculate all analyses
         feature_importance = self.calculate_feature_importance(portfolio, strategy)
         attributions = self.analyze_trade_attributions(portfolio)
         failures = self.identify_failure_cases(portfolio)
-        failure_clusters = self.cluster_failures()
+        counts, total_losses = self._summarize_clusters()
+        
+        # (reason, count, total_loss) by descending count; ties keep first-seen order
+        reason_codes, first_seen = np.unique(self._failure_codes, return_index=True)
+        order = np.lexsort((first_seen, -counts[reason_codes]))
+        failure_summary = [
+            (REASON_NAMES[code], int(counts[code]), float(total_losses[code]))
+            for code in reason_codes[order]
+        ]
+        
+        return ReportData(
+            strategy_name=strategy.name,
+            feature_importance=feature_importance,
+            attributions=attributions,
+            failure_summary=failure_summary,
+            num_failures=len(failures),
+            total_pnl=results['total_pnl'] if attributions['num_trades'] > 0 else None,
+            insights=self._generate_insights(portfolio, feature_importance,
+                                             attributions, failure_summary)
+        )
+    
+    def render_summary_report(self, data: ReportData) -> str:
+        """
+        Format precomputed report data as the summary report.
         
-        report_lines = []
-        report_lines.append(f"\n{'='*70}")
-        report_lines.append(f"EXPLAINABILITY REPORT: {strategy.name}")
-        report_lines.append(f"{'='*70}\n")
+        Args:
+            data: Output of compute_report_data
+            
+        Returns:
+            String report
+        """
+        feature_importance = data.feature_importance
+        attributions = data.attributions
+        failure_summary = data.failure_summary
+        
+        buf = io.StringIO()
+        w = buf.write
+        w(f"\n{SEP70}\n")
+        w(f"EXPLAINABILITY REPORT: {data.strategy_name}\n")
+        w(f"{SEP70}\n\n")
         
         # Feature Importance Section
-        report_lines.append(f"1. FEATURE IMPORTANCE")
-        report_lines.append(f"   (What factors most influenced performance?)")
-        report_lines.append(f"{'-'*70}")
+        w("1. FEATURE IMPORTANCE\n")
+        w("   (What factors most influenced performance?)\n")
+        w(f"{DASH70}\n")
         
         if feature_importance:
             sorted_features = sorted(feature_importance.items(), 
                                    key=lambda x: x[1], reverse=True)
             for feature, importance in sorted_features:
-                bar_length = int(importance * BAR_CHART_LENGTH)
-                bar = '█' * bar_length + '░' * (BAR_CHART_LENGTH - bar_length)
-                report_lines.append(f"   {feature:30s} {bar} {importance:.2%}")
+                bar = BARS[int(importance * BAR_CHART_LENGTH)]
+                w(f"   {feature:30s} {bar} {importance:.2%}\n")
         else:
-            report_lines.append(f"   No trades to analyze")
+            w("   No trades to analyze\n")
         
         # Trade Attribution Section
-        report_lines.append(f"\n2. TRADE ATTRIBUTION")
-        report_lines.append(f"   (Where did PnL come from?)")
-        report_lines.append(f"{'-'*70}")
+        w("\n2. TRADE ATTRIBUTION\n")
+        w("   (Where did PnL come from?)\n")
+        w(f"{DASH70}\n")
         
         if attributions['num_trades'] > 0:
-            report_lines.append(f"   Entry Quality:    ${attributions['total_entry_pnl']:+8.2f} (avg: ${attributions['avg_entry_pnl']:+.2f}/trade)")
-            report_lines.append(f"   Market Drift:     ${attributions['total_drift_pnl']:+8.2f} (avg: ${attributions['avg_drift_pnl']:+.2f}/trade)")
-            report_lines.append(f"   Exit/Outcome:     ${attributions['total_exit_pnl']:+8.2f} (avg: ${attributions['avg_exit_pnl']:+.2f}/trade)")
-            report_lines.append(f"   {'─'*70}")
-            total_pnl = results['total_pnl']
-            report_lines.append(f"   Total PnL:        ${total_pnl:+8.2f}")
+            w(f"   Entry Quality:    ${attributions['total_entry_pnl']:+8.2f} (avg: ${attributions['avg_entry_pnl']:+.2f}/trade)\n")
+            w(f"   Market Drift:     ${attributions['total_drift_pnl']:+8.2f} (avg: ${attributions['avg_drift_pnl']:+.2f}/trade)\n")
+            w(f"   Exit/Outcome:     ${attributions['total_exit_pnl']:+8.2f} (avg: ${attributions['avg_exit_pnl']:+.2f}/trade)\n")
+            w(f"   {RULE70}\n")
+            w(f"   Total PnL:        ${data.total_pnl:+8.2f}\n")
         else:
-            report_lines.append(f"   No trades to analyze")
+            w("   No trades to analyze\n")
         
         # Failure Analysis Section
-        report_lines.append(f"\n3. FAILURE CASE ANALYSIS")
-        report_lines.append(f"   (Why did we lose money?)")
-        report_lines.append(f"{'-'*70}")
-        
-        if failure_clusters:
-            report_lines.append(f"   Total losing trades: {len(failures)}")
-            report_lines.append(f"")
-            report_lines.append(f"   Failure breakdown:")
-            
-            sorted_clusters = sorted(failure_clusters.items(), 
-                                    key=lambda x: len(x[1]), reverse=True)
+        w("\n3. FAILURE CASE ANALYSIS\n")
+        w("   (Why did we lose money?)\n")
+        w(f"{DASH70}\n")
+        
+        if failure_summary:
+            w(f"   Total losing trades: {data.num_failures}\n")
+            w("\n")
+            w("   Failure breakdown:\n")
             
-            for reason, cases in sorted_clusters:
-                count = len(cases)
-                total_loss = sum(abs(c.pnl) for c in cases)
+            for reason, count, total_loss in failure_summary:
                 avg_loss = total_loss / count if count > 0 else 0
-                report_lines.append(f"   • {reason}")
-                report_lines.append(f"     Count: {count}, Total Loss: ${total_loss:.2f}, Avg: ${avg_loss:.2f}")
+                w(f"   • {reason}\n")
+                w(f"     Count: {count}, Total Loss: ${total_loss:.2f}, Avg: ${avg_loss:.2f}\n")
         else:
             if attributions['num_trades'] > 0:
-                report_lines.append(f"   ✓ No losing trades!")
+                w("   ✓ No losing trades!\n")
             else:
-                report_lines.append(f"   No trades to analyze")
+                w("   No trades to analyze\n")
         
         # Key Insights
-        report_lines.append(f"\n4. KEY INSIGHTS")
-        report_lines.append(f"{'-'*70}")
+        w("\n4. KEY INSIGHTS\n")
+        w(f"{DASH70}\n")
         
-        insights = self._generate_insights(portfolio, feature_importance, 
-                                           attributions, failure_clusters)
-        for insight in insights:
-            report_lines.append(f"   • {insight}")
+        for insight in data.insights:
+            w(f"   • {insight}\n")
         
-        report_lines.append(f"\n{'='*70}\n")
+        w(f"\n{SEP70}\n")
         
-        return "\n".join(report_lines)
+        return buf.getvalue()
     
     def _generate_insights(self,
                           portfolio: 'Portfolio',
                           feature_importance: Dict[str, float],
                           attributions: Dict,
-                          failure_clusters: Dict) -> List[str]:
+                          failure_summary: List[Tuple[str, int, float]]) -> List[str]:
         """
         Generate key insights from the analysis.
         
+        Args:
+            failure_summary: (reason, count, total_loss) tuples, most common first
+        
         Returns:
             List of insight strings
         """
@@ -571,13 +1060,13 @@ class ExplainabilityEngine:
                 insights.append("Entry prices were generally good (below fair value)")
         
         # Failure insights
-        if failure_clusters:
-            most_common = max(failure_clusters.items(), key=lambda x: len(x[1]))
-            insights.append(f"Most common failure: {most_common[0]} ({len(most_common[1])} cases)")
+        if failure_summary:
+            most_common_reason, most_common_count, _ = failure_summary[0]
+            insights.append(f"Most common failure: {most_common_reason} ({most_common_count} cases)")
             
             # Check for expensive entries
-            expensive_entries = failure_clusters.get("Expensive entry (low reward/risk)", [])
-            if len(expensive_entries) > 2:
+            failure_counts = {reason: count for reason, count, _ in failure_summary}
+            if failure_counts.get(REASON_NAMES[REASON_EXPENSIVE_ENTRY], 0) > 2:
                 insights.append("Strategy is entering too many expensive positions (>0.7 price)")
         
         if not insights:
@@ -6,8 +6,22 @@ from typing import Dict, Tuple
 import pandas as pd
 import numpy as np
 
+from .numba_compat import njit
+from .time_utils import HOUR_NS, MINUTE_NS
 
-@dataclass
+# Price direction of each trade side: buyers pay up, sellers receive less
+SIDE_SIGNS = {"buy": 1.0, "sell": -1.0}
+
+
+def _side_sign(side: str) -> float:
+    """+1.0 for "buy", -1.0 for "sell"."""
+    try:
+        return SIDE_SIGNS[side]
+    except KeyError:
+        raise ValueError(f"side must be 'buy' or 'sell', got {side!r}") from None
+
+
+@dataclass(slots=True)
 class TradeExecution:
     """Result of trade execution with microstructure effects."""
     executed: bool
@@ -18,6 +32,47 @@ class TradeExecution:
     reason: str = ""  # Reason if not executed
 
 
+@njit(cache=True)
+def _price_core(mid_price, quantity, side_sign, half_spread, slippage_per_contract):
+    """
+    Execution price and slippage for one order; the single pricing formula.
+    
+    Returns:
+        Tuple of (execution_price, slippage)
+    """
+    # Buyers pay the ask (mid + half spread) and push the price up;
+    # sellers receive the bid (mid - half spread) and push it down
+    price_with_spread = mid_price + side_sign * half_spread
+    
+    # Larger orders move the price more; clamp to valid price range [0.01, 0.99]
+    execution_price = price_with_spread + side_sign * (quantity * slippage_per_contract)
+    execution_price = min(max(execution_price, 0.01), 0.99)
+    
+    # Slippage reflects the actual (possibly clipped) execution price
+    slippage = abs(execution_price - price_with_spread)
+    
+    return execution_price, slippage
+
+
+@njit(cache=True)
+def _exec_core(mid_price, quantity, side_sign, half_spread, slippage_per_contract, available):
+    """
+    Numeric core of MarketMicrostructure.execute_trade on plain floats.
+    
+    Returns:
+        Tuple of (executed, quantity_filled, execution_price, spread_cost, slippage)
+    """
+    if available <= 0:
+        return False, 0.0, 0.0, 0.0, 0.0
+    
+    # Partial fill when the order exceeds what is left this minute
+    filled = quantity if quantity <= available else available
+    
+    execution_price, slippage = _price_core(mid_price, filled, side_sign, half_spread, slippage_per_contract)
+    
+    return True, filled, execution_price, half_spread, slippage
+
+
 class MarketMicrostructure:
     """
     Models realistic market microstructure effects:
@@ -46,12 +101,143 @@ class MarketMicrostructure:
         self.max_liquidity_per_minute = max_liquidity_per_minute
         self.latency_minutes = latency_minutes
         
-        # Track liquidity consumption per timestamp
-        self.liquidity_consumed: Dict[pd.Timestamp, float] = {}
+        # Derived pricing constants (the parameters above are fixed after init)
+        self._half_spread = bid_ask_spread / 2
+        self._slip_per_contract = slippage_per_100_contracts / 100.0
+        self._latency_ns = int(latency_minutes * MINUTE_NS)
+        
+        # Track liquidity consumption per minute of one clock hour (slot = minute
+        # 0-59); the slots are cleared whenever a timestamp from another hour
+        # arrives, so they never mix minutes of different hours
+        self._liquidity_by_minute = np.zeros(60, dtype=np.float64)
+        self._liquidity_hour_ns = None
+        self._liquidity_hour_start = None
+        
+        # Orders waiting out the latency delay, stored as parallel arrays:
+        # execution deadline in ns, caller-defined action code, and quantity
+        # (kept as the caller's object so fills preserve its type). Live orders
+        # occupy [_pending_head, _pending_n); released orders just advance the head
+        self._pending_deadline_ns = np.empty(64, dtype=np.int64)
+        self._pending_action = np.empty(64, dtype=np.uint8)
+        self._pending_qty = np.empty(64, dtype=object)
+        self._pending_head = 0
+        self._pending_n = 0
     
     def reset_hour(self):
         """Reset state for a new trading hour."""
-        self.liquidity_consumed.clear()
+        self._liquidity_by_minute.fill(0.0)
+        self._liquidity_hour_ns = None
+        self._liquidity_hour_start = None
+        self._pending_head = 0
+        self._pending_n = 0
+    
+    @property
+    def liquidity_consumed(self) -> Dict[pd.Timestamp, float]:
+        """Liquidity consumed so far per minute timestamp of the current hour."""
+        if self._liquidity_hour_start is None:
+            return {}
+        return {
+            self._liquidity_hour_start + pd.Timedelta(minutes=minute): consumed
+            for minute, consumed in enumerate(self._liquidity_by_minute.tolist())
+            if consumed
+        }
+    
+    def _liquidity_slot(self, timestamp: pd.Timestamp) -> int:
+        """
+        Slot of a (minute-level) timestamp in _liquidity_by_minute.
+        
+        Clears the slots first when the timestamp falls in a different hour
+        from the one they hold.
+        """
+        ns = timestamp.value
+        offset = ns % HOUR_NS
+        if ns - offset != self._liquidity_hour_ns:
+            self._liquidity_by_minute.fill(0.0)
+            self._liquidity_hour_ns = ns - offset
+            self._liquidity_hour_start = timestamp - pd.Timedelta(offset, unit='ns')
+        return offset // MINUTE_NS
+    
+    @property
+    def pending_order_count(self) -> int:
+        """Number of queued orders still waiting out the latency delay."""
+        return self._pending_n - self._pending_head
+    
+    def add_pending_order(self,
+                          decision_time: pd.Timestamp,
+                          action_code: int,
+                          quantity: float):
+        """
+        Queue a trade decision until the latency delay has passed.
+        
+        Args:
+            decision_time: Timestamp the decision was made
+            action_code: Small integer (0-255) identifying the trade action
+            quantity: Desired quantity
+        """
+        head = self._pending_head
+        n = self._pending_n
+        if n == len(self._pending_deadline_ns):
+            if head:
+                # Reclaim the slots of released orders before growing
+                live = n - head
+                self._pending_deadline_ns[:live] = self._pending_deadline_ns[head:n]
+                self._pending_action[:live] = self._pending_action[head:n]
+                self._pending_qty[:live] = self._pending_qty[head:n]
+                head = self._pending_head = 0
+                n = live
+            else:
+                # Double capacity when full
+                self._pending_deadline_ns = np.concatenate((self._pending_deadline_ns, np.empty(n, dtype=np.int64)))
+                self._pending_action = np.concatenate((self._pending_action, np.empty(n, dtype=np.uint8)))
+                self._pending_qty = np.concatenate((self._pending_qty, np.empty(n, dtype=object)))
+        
+        deadline = decision_time.value + self._latency_ns
+        if n > head and deadline < self._pending_deadline_ns[n - 1]:
+            # Decisions normally arrive in time order; otherwise insert so the
+            # deadlines stay sorted for get_executable_orders
+            i = head + int(np.searchsorted(self._pending_deadline_ns[head:n], deadline, side='right'))
+            self._pending_deadline_ns[i + 1:n + 1] = self._pending_deadline_ns[i:n]
+            self._pending_action[i + 1:n + 1] = self._pending_action[i:n]
+            self._pending_qty[i + 1:n + 1] = self._pending_qty[i:n]
+        else:
+            i = n
+        
+        self._pending_deadline_ns[i] = deadline
+        self._pending_action[i] = action_code
+        self._pending_qty[i] = quantity
+        self._pending_n = n + 1
+    
+    def get_executable_orders(self,
+                              current_time: pd.Timestamp) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Remove and return pending orders whose latency delay has passed.
+        
+        Args:
+            current_time: Current timestamp
+            
+        Returns:
+            Tuple of (decision_times, action_codes, quantities) in deadline order,
+            with decision times as int64 nanoseconds since the epoch (UTC)
+        """
+        head = self._pending_head
+        n = self._pending_n
+        # Deadlines are kept sorted, so the ready orders are a prefix of the live ones
+        end = head + int(np.searchsorted(self._pending_deadline_ns[head:n], current_time.value, side='right'))
+        if end == head:
+            return self._pending_deadline_ns[:0], self._pending_action[:0], self._pending_qty[:0]
+        
+        # Decision times are recovered from the deadlines; callers that need
+        # Timestamps can wrap them with pd.to_datetime
+        executable = (self._pending_deadline_ns[head:end] - self._latency_ns,
+                      self._pending_action[head:end].copy(), self._pending_qty[head:end].copy())
+        
+        # Release the orders by advancing the head; an empty queue restarts at 0
+        if end == n:
+            self._pending_head = self._pending_n = 0
+        else:
+            self._pending_head = end
+        
+        return executable
     
     def get_execution_price(self,
                            mid_price: float,
@@ -68,38 +254,11 @@ class MarketMicrostructure:
         Returns:
             Tuple of (execution_price, spread_cost, slippage)
         """
-        # Apply bid-ask spread (buyers pay ask, sellers receive bid)
-        half_spread = self.bid_ask_spread / 2
-        
-        if side == "buy":
-            # Buying: pay the ask price (mid + half spread)
-            price_with_spread = mid_price + half_spread
-        else:
-            # Selling: receive the bid price (mid - half spread)
-            price_with_spread = mid_price - half_spread
-        
-        # Calculate slippage based on order size
-        # Larger orders move the price more
-        slippage_factor = (quantity / 100.0) * self.slippage_per_100_contracts
-        
-        if side == "buy":
-            # Price moves up when buying
-            slippage = slippage_factor
-            execution_price = price_with_spread + slippage
-        else:
-            # Price moves down when selling
-            slippage = slippage_factor
-            execution_price = price_with_spread - slippage
-        
-        # Clamp to valid price range [0.01, 0.99]
-        execution_price = np.clip(execution_price, 0.01, 0.99)
-        
-        # Recompute slippage to reflect the actual (possibly clipped) execution price
-        slippage = float(abs(execution_price - price_with_spread))
-        
-        spread_cost = half_spread
-        
-        return execution_price, spread_cost, slippage
+        execution_price, slippage = _price_core(
+            float(mid_price), float(quantity), _side_sign(side),
+            self._half_spread, self._slip_per_contract
+        )
+        return execution_price, self._half_spread, slippage
     
     def check_liquidity(self, 
                        timestamp: pd.Timestamp,
@@ -115,7 +274,7 @@ class MarketMicrostructure:
             Tuple of (can_execute, available_quantity)
         """
         # Get how much liquidity has been consumed this minute
-        consumed = self.liquidity_consumed.get(timestamp, 0.0)
+        consumed = self._liquidity_by_minute.item(self._liquidity_slot(timestamp))
         available = self.max_liquidity_per_minute - consumed
         
         if available <= 0:
@@ -135,8 +294,7 @@ class MarketMicrostructure:
             timestamp: Timestamp of the trade
             quantity: Quantity traded
         """
-        current = self.liquidity_consumed.get(timestamp, 0.0)
-        self.liquidity_consumed[timestamp] = current + quantity
+        self._liquidity_by_minute[self._liquidity_slot(timestamp)] += quantity
     
     def rollback_liquidity(self, timestamp: pd.Timestamp, quantity: float):
         """
@@ -146,8 +304,8 @@ class MarketMicrostructure:
             timestamp: Timestamp of the trade
             quantity: Quantity to roll back
         """
-        current = self.liquidity_consumed.get(timestamp, 0.0)
-        self.liquidity_consumed[timestamp] = max(0.0, current - quantity)
+        slot = self._liquidity_slot(timestamp)
+        self._liquidity_by_minute[slot] = max(0.0, self._liquidity_by_minute[slot] - quantity)
     
     def execute_trade(self,
                      timestamp: pd.Timestamp,
@@ -166,10 +324,61 @@ class MarketMicrostructure:
         Returns:
             TradeExecution object with results
         """
-        # Check liquidity constraints
-        can_execute, available_qty = self.check_liquidity(timestamp, quantity)
+        return self._execute_fused(timestamp, mid_price, quantity, _side_sign(side))
+    
+    def quote_trade(self,
+                    timestamp: pd.Timestamp,
+                    mid_price: float,
+                    quantity: float,
+                    side: str = "buy") -> TradeExecution:
+        """
+        Price a trade as execute_trade would, without consuming liquidity.
+        
+        Callers that go ahead with the trade record it with consume_liquidity
+        using the quoted quantity_executed.
         
-        if not can_execute:
+        Args:
+            timestamp: Trade timestamp
+            mid_price: Mid-market price
+            quantity: Desired quantity
+            side: "buy" or "sell"
+            
+        Returns:
+            TradeExecution object with results
+        """
+        return self._execute_fused(timestamp, mid_price, quantity, _side_sign(side), consume=False)
+    
+    def _execute_fused(self,
+                       timestamp: pd.Timestamp,
+                       mid_price: float,
+                       quantity: float,
+                       side_sign: float,
+                       consume: bool = True) -> TradeExecution:
+        """
+        Liquidity check, pricing and liquidity consumption in one step.
+        
+        Reads and writes this minute's liquidity slot once, instead of going
+        through check_liquidity/consume_liquidity separately.
+        
+        Args:
+            timestamp: Trade timestamp
+            mid_price: Mid-market price
+            quantity: Desired quantity
+            side_sign: +1 to buy, -1 to sell
+            consume: Record the filled quantity against this minute's liquidity
+            
+        Returns:
+            TradeExecution object with results
+        """
+        slot = self._liquidity_slot(timestamp)
+        consumed = self._liquidity_by_minute.item(slot)
+        executed, filled, exec_price, spread_cost, slippage = _exec_core(
+            float(mid_price), float(quantity), side_sign,
+            self._half_spread, self._slip_per_contract,
+            self.max_liquidity_per_minute - consumed
+        )
+        
+        if not executed:
             return TradeExecution(
                 executed=False,
                 execution_price=0.0,
@@ -179,16 +388,12 @@ class MarketMicrostructure:
                 reason="Insufficient liquidity"
             )
         
-        # Use available quantity (might be partial fill)
-        final_quantity = min(quantity, available_qty)
-        
-        # Calculate execution price with spread and slippage
-        exec_price, spread_cost, slippage = self.get_execution_price(
-            mid_price, final_quantity, side
-        )
+        # Keep the caller's quantity unless the order was partially filled
+        final_quantity = quantity if filled == quantity else filled
         
         # Consume liquidity
-        self.consume_liquidity(timestamp, final_quantity)
+        if consume:
+            self._liquidity_by_minute[slot] = consumed + final_quantity
         
         return TradeExecution(
             executed=True,
@@ -2,39 +2,230 @@
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, List
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Sequence, Tuple
 import csv
+import hashlib
+import json
 import os
+import time
+from .numba_compat import NUMBA_AVAILABLE, njit
+from .time_utils import HOUR_NS, NAT_NS
+
+# Below this many contract price rows the per-segment NumPy path beats JIT dispatch
+JIT_MIN_TICKS = 100_000
+
+# Strikes further from spot than max(PRUNE_INTERVALS price intervals,
+# PRUNE_VOLATILITY_MULTIPLE x volatility x spot) are not scored
+PRUNE_INTERVALS = 4
+PRUNE_VOLATILITY_MULTIPLE = 3
+PRUNE_FALLBACK_STRIKES = 5  # Nearest strikes kept when pruning would drop them all
+
+# On-disk metrics cache: bump the version whenever the metric definitions change
+METRICS_CACHE_VERSION = 2
+METRICS_CACHE_MAX_ENTRIES = 16  # Least frequently used entries are evicted beyond this
+METRIC_NAMES = ('avg_spread', 'volume_proxy', 'price_reaction')
+
+# Price-change variance at or below which a series counts as constant
+REACTION_VARIANCE_EPS = 1e-12
+
+
+@njit(cache=True)
+def _segment_stats_kernel(yes, no, bounds):
+    """
+    Spread mean and volume proxy of every [bounds[i], bounds[i + 1]) segment.
+    
+    One pass per segment over the YES/NO columns, skipping NaN like
+    np.nanmean/np.nansum. Sums run sequentially, so results can differ from
+    the NumPy path in the last bits.
+    """
+    n_segments = len(bounds) - 1
+    spreads = np.empty(n_segments)
+    volumes = np.empty(n_segments)
+    for s in range(n_segments):
+        lo = bounds[s]
+        hi = bounds[s + 1]
+        spread_sum = 0.0
+        spread_count = 0
+        yes_volume = 0.0
+        no_volume = 0.0
+        for i in range(lo, hi):
+            spread = abs((yes[i] + no[i]) - 1.0)
+            if not np.isnan(spread):
+                spread_sum += spread
+                spread_count += 1
+            if i > lo:
+                yes_change = abs(yes[i] - yes[i - 1])
+                if not np.isnan(yes_change):
+                    yes_volume += yes_change
+                no_change = abs(no[i] - no[i - 1])
+                if not np.isnan(no_change):
+                    no_volume += no_change
+        spreads[s] = spread_sum / spread_count if spread_count > 0 else np.nan
+        volumes[s] = yes_volume + no_volume
+    return spreads, volumes
+
+
+@njit(cache=True)
+def _change_correlation(a, b):
+    """
+    Absolute Pearson correlation between the successive changes of a and b.
+    
+    Pairs where either change is NaN are skipped. Two passes over the
+    changes (means, then centered sums) with no intermediate arrays.
+    
+    Returns:
+        Correlation magnitude in [0, 1], or 0.0 with fewer than two valid
+        pairs or when either series of changes is (near) constant
+    """
+    n = 0
+    sum_a = 0.0
+    sum_b = 0.0
+    for i in range(1, len(a)):
+        da = a[i] - a[i - 1]
+        db = b[i] - b[i - 1]
+        if not (np.isnan(da) or np.isnan(db)):
+            n += 1
+            sum_a += da
+            sum_b += db
+    if n < 2:
+        return 0.0
+    mean_a = sum_a / n
+    mean_b = sum_b / n
+    
+    saa = 0.0
+    sbb = 0.0
+    sab = 0.0
+    for i in range(1, len(a)):
+        da = a[i] - a[i - 1]
+        db = b[i] - b[i - 1]
+        if not (np.isnan(da) or np.isnan(db)):
+            da -= mean_a
+            db -= mean_b
+            saa += da * da
+            sbb += db * db
+            sab += da * db
+    if saa <= REACTION_VARIANCE_EPS * n or sbb <= REACTION_VARIANCE_EPS * n:
+        return 0.0
+    return min(1.0, abs(sab) / np.sqrt(saa * sbb))
+
+
+@dataclass(slots=True)
+class _BtcHour:
+    """BTC prices of one hour window, shared by every strike of that hour."""
+    times: np.ndarray  # Distinct int64 ns timestamps, in time order
+    prices: np.ndarray  # Price at each of those timestamps (first row if duplicated)
+    comparable: bool  # Times share the contract times' timezone awareness
 
 
 class MarketSelector:
     """Select the appropriate market based on current BTC price at hour start."""
     
-    def __init__(self, btc_price_interval: int = 250, log_path: str = "data/market_selection_log.csv"):
+    # Log directories already created by any selector in this process
+    _log_dirs = set()
+    
+    def __init__(self, btc_price_interval: int = 250, log_path: str = "data/market_selection_log.csv",
+                 metrics_cache_dir: Optional[str] = None):
         """
         Initialize market selector.
         
         Args:
             btc_price_interval: Price interval for market buckets (default: $250)
             log_path: Path to save market selection log
+            metrics_cache_dir: Directory to persist precomputed market metrics
+                across runs (default: None, no disk cache)
         """
         self.btc_price_interval = btc_price_interval
         self.log_path = log_path
-        self.selection_log = []
+        self.metrics_cache_dir = metrics_cache_dir
+        
+        # Strike offsets from the base strike, keyed by num_strikes
+        self._strike_offsets: Dict[int, np.ndarray] = {}
+        
+        # In-memory selection log, one list per column (see selection_log)
+        self._log_hours: List[pd.Timestamp] = []
+        self._log_spots: List[float] = []
+        self._log_strikes: List[float] = []
+        self._log_methods: List[str] = []
+        self._log_metrics: List[Dict] = []
+        self._log_spreads: List[float] = []
+        self._log_volumes: List[float] = []
+        self._log_reactions: List[float] = []
+        self._log_volatilities: List[float] = []
+        
+        # Market lookups built by set_markets()/precompute(), keyed by hour_start in ns
+        self._markets_source = None
+        self._btc_source = None
+        self._hour_strikes: Dict[int, List[float]] = {}
+        self._market_rows: Dict[Tuple[int, float], Tuple[pd.Timestamp, pd.Timestamp]] = {}
+        self._spot_by_hour: Dict[int, float] = {}
+        
+        # Price columns as contiguous arrays, built by _prepare(). Contract rows
+        # are sorted by (hour, strike); timestamps are int64 ns
+        self._contracts_source = None
+        self._btc_arrays_source = None
+        self._contract_order = np.empty(0, dtype=np.intp)
+        self._contract_hours = np.empty(0, dtype=np.int64)
+        self._contract_ts = np.empty(0, dtype=np.int64)
+        self._contract_strikes = np.empty(0, dtype=np.float64)
+        self._contract_yes = np.empty(0, dtype=np.float64)
+        self._contract_no = np.empty(0, dtype=np.float64)
+        self._contract_tz = None
+        self._btc_ts = np.empty(0, dtype=np.int64)
+        self._btc_price = np.empty(0, dtype=np.float64)
+        self._btc_sorted = True
+        self._btc_tz = None
         
-        # Initialize log file
-        self._init_log_file()
+        # Metrics built by precompute_metrics(), keyed by (hour_start in ns, strike)
+        self._metrics_sources = None
+        self._metrics_cache: Dict[Tuple[int, float], Dict[str, float]] = {}
+        
+        # Volatility estimates for _volatility_source, keyed by lookback_hours
+        self._volatility_source = None
+        self._volatility_cache: Dict[int, float] = {}
+        
+        # get_market_for_hour results for the DataFrames in _selection_sources, keyed
+        # by (hour_start in ns, use_intelligent_selection); replays still log
+        self._selection_sources = None
+        self._selection_cache: Dict[Tuple[int, bool], Tuple[dict, float, Dict]] = {}
+        
+        # Log file is created by the first _log_selection call
+        self._log_file = None
+        self._log_writer = None
+        self._log_initialized = False
     
     def _init_log_file(self):
-        """Initialize the market selection log CSV file."""
-        os.makedirs(os.path.dirname(self.log_path) if os.path.dirname(self.log_path) else '.', exist_ok=True)
-        with open(self.log_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                'hour_start', 'btc_spot_price', 'selected_strike', 'selection_method',
-                'avg_spread', 'avg_volume_proxy', 'price_reaction_score', 'volatility_estimate',
-                'num_strikes_considered', 'reason'
-            ])
+        """Initialize the market selection log CSV file and keep it open for appends."""
+        # Absolute, so a relative log path is created again after a chdir
+        log_dir = os.path.abspath(os.path.dirname(self.log_path) or '.')
+        if log_dir not in MarketSelector._log_dirs:
+            os.makedirs(log_dir, exist_ok=True)
+            MarketSelector._log_dirs.add(log_dir)
+        self._log_file = open(self.log_path, 'w', newline='', buffering=1 << 20)
+        self._log_writer = csv.writer(self._log_file)
+        self._log_writer.writerow([
+            'hour_start', 'btc_spot_price', 'selected_strike', 'selection_method',
+            'avg_spread', 'avg_volume_proxy', 'price_reaction_score', 'volatility_estimate',
+            'num_strikes_considered', 'reason'
+        ])
+        self._log_initialized = True
+    
+    def flush(self):
+        """Write buffered selection log rows to disk."""
+        if self._log_file is not None:
+            self._log_file.flush()
+    
+    def close(self):
+        """Flush and close the selection log file; later selections reopen it for appending."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+            self._log_writer = None
+    
+    def __del__(self):
+        # _log_file is missing if __init__ failed before opening it
+        if getattr(self, '_log_file', None) is not None:
+            self.close()
     
     def _calculate_market_metrics(self, 
                                   hour_start: pd.Timestamp,
@@ -58,71 +249,402 @@ class MarketSelector:
         Returns:
             Dictionary with metrics
         """
-        hour_end = hour_start + pd.Timedelta(hours=1)
+        return self._calculate_hour_metrics(
+            hour_start, [strike_price], contract_prices, btc_prices
+        )[strike_price]
+    
+    def _calculate_hour_metrics(self,
+                                hour_start: pd.Timestamp,
+                                strikes: List[float],
+                                contract_prices: pd.DataFrame,
+                                btc_prices: pd.DataFrame) -> Dict[float, Dict[str, float]]:
+        """
+        Calculate market metrics for several strikes of the same hour.
         
-        # Filter contract prices for this hour and strike
-        mask = (
-            (contract_prices['timestamp'] >= hour_start) &
-            (contract_prices['timestamp'] < hour_end) &
-            (contract_prices['strike_price'] == strike_price)
-        )
-        hour_contracts = contract_prices[mask].copy()
+        The hour is located in the arrays built by _prepare() with a binary
+        search, instead of masking the full frames per strike.
+        
+        Args:
+            hour_start: Start of the trading hour
+            strikes: Strike prices to analyze
+            contract_prices: DataFrame with contract prices
+            btc_prices: DataFrame with BTC prices
+            
+        Returns:
+            Dictionary mapping each strike to its metrics (see _calculate_market_metrics)
+        """
+        self._prepare(contract_prices, btc_prices)
+        start = pd.Timestamp(hour_start).value
+        end = start + HOUR_NS
+        
+        # Contract rows of this hour, ordered by strike then frame order
+        if start % HOUR_NS == 0:
+            lo = np.searchsorted(self._contract_hours, start, side='left')
+            hi = np.searchsorted(self._contract_hours, start, side='right')
+            rows = np.arange(lo, hi)
+        else:
+            rows = np.flatnonzero((self._contract_ts >= start) & (self._contract_ts < end))
+            rows = rows[np.lexsort((self._contract_order[rows], self._contract_strikes[rows]))]
+        btc_hour = self._btc_hour(start, end)
+        btc_matches = self._match_btc(self._contract_ts[rows], btc_hour)
         
-        if hour_contracts.empty or len(hour_contracts) < 2:
+        row_strikes = self._contract_strikes[rows]
+        metrics = {}
+        for strike in strikes:
+            lo = np.searchsorted(row_strikes, strike, side='left')
+            hi = np.searchsorted(row_strikes, strike, side='right')
+            metrics[strike] = self._segment_metrics(
+                rows[lo:hi], btc_hour, btc_matches[lo:hi] if btc_matches is not None else None
+            )
+        return metrics
+    
+    def _segment_metrics(self,
+                         segment: np.ndarray,
+                         btc_hour: _BtcHour,
+                         btc_matches: Optional[np.ndarray],
+                         stats: Optional[Tuple[float, float]] = None) -> Dict[str, float]:
+        """
+        Calculate market metrics for one strike and hour.
+        
+        Args:
+            segment: Positions of the strike's rows in the prepared contract arrays
+            btc_hour: BTC prices of the hour, from _btc_hour
+            btc_matches: Matching positions in btc_hour for the segment rows (see _match_btc)
+            stats: (avg_spread, volume_proxy) already computed by _segment_stats_kernel
+            
+        Returns:
+            Dictionary with metrics
+        """
+        if len(segment) < 2:
             return {
                 'avg_spread': 1.0,  # Worst spread
                 'volume_proxy': 0.0,
                 'price_reaction': 0.0
             }
         
-        # Calculate spread (lower is better)
-        hour_contracts['spread'] = abs(
-            (hour_contracts['yes_price'] + hour_contracts['no_price']) - 1.0
-        )
-        avg_spread = hour_contracts['spread'].mean()
-        
-        # Calculate volume proxy (sum of price change magnitudes = more activity)
-        yes_changes = hour_contracts['yes_price'].diff().abs().sum()
-        no_changes = hour_contracts['no_price'].diff().abs().sum()
-        volume_proxy = yes_changes + no_changes
-        
-        # Calculate price reaction to BTC movements
-        # Merge with BTC prices
-        hour_btc = btc_prices[
-            (btc_prices.index >= hour_start) & 
-            (btc_prices.index < hour_end)
-        ].copy()
-        
-        if len(hour_btc) < 2:
-            price_reaction = 0.0
+        if stats is not None:
+            avg_spread, volume_proxy = stats
         else:
-            # Align timestamps
-            hour_contracts_indexed = hour_contracts.set_index('timestamp')
-            common_times = hour_contracts_indexed.index.intersection(hour_btc.index)
+            yes = self._contract_yes[segment]
+            no = self._contract_no[segment]
             
-            if len(common_times) < 2:
-                price_reaction = 0.0
-            else:
-                btc_changes = hour_btc.loc[common_times, 'price'].diff()
-                yes_changes_aligned = hour_contracts_indexed.loc[common_times, 'yes_price'].diff()
-                
-                # Calculate correlation (higher absolute correlation = more reactive)
-                if btc_changes.std() > 0 and yes_changes_aligned.std() > 0:
-                    corr_value = btc_changes.corr(yes_changes_aligned)
-                    price_reaction = 0.0 if pd.isna(corr_value) else abs(corr_value)
-                else:
-                    price_reaction = 0.0
+            # Calculate spread (lower is better)
+            avg_spread = np.nanmean(np.abs((yes + no) - 1.0))
+            
+            # Calculate volume proxy (sum of price change magnitudes = more activity)
+            # (leading NaN keeps the summation layout of Series.diff().abs().sum())
+            volume_proxy = (np.nansum(np.abs(np.diff(yes, prepend=np.nan))) +
+                            np.nansum(np.abs(np.diff(no, prepend=np.nan))))
         
         return {
             'avg_spread': avg_spread,
             'volume_proxy': volume_proxy,
-            'price_reaction': price_reaction
+            'price_reaction': self._calculate_price_reaction(segment, btc_hour, btc_matches)
         }
     
+    def precompute_metrics(self, contract_prices: pd.DataFrame, btc_prices: pd.DataFrame):
+        """
+        Calculate market metrics for every (hour, strike) in the contract prices.
+        
+        select_intelligent_strike calls this automatically whenever it is given
+        different DataFrames than last time and then only looks metrics up.
+        
+        Args:
+            contract_prices: DataFrame with contract prices
+            btc_prices: DataFrame with BTC prices (indexed by timestamp)
+        """
+        self._prepare(contract_prices, btc_prices)
+        hours = self._contract_hours
+        strikes = self._contract_strikes
+        
+        # Reuse metrics saved by an earlier run on the same data
+        cache_key = None
+        if self.metrics_cache_dir:
+            cache_key = self._metrics_cache_key()
+            cached = self._load_metrics_cache(cache_key)
+            if cached is not None:
+                self._metrics_cache = cached
+                self._metrics_sources = (contract_prices, btc_prices)
+                return
+        
+        # Boundaries of the contiguous (hour, strike) segments
+        breaks = np.flatnonzero((hours[1:] != hours[:-1]) | (strikes[1:] != strikes[:-1])) + 1
+        bounds = np.concatenate(([0], breaks, [len(hours)])) if len(hours) else np.zeros(1, dtype=np.intp)
+        
+        # Spread and volume of all segments in one compiled pass for large inputs
+        segment_stats = None
+        if NUMBA_AVAILABLE and len(hours) >= JIT_MIN_TICKS:
+            segment_stats = zip(*_segment_stats_kernel(self._contract_yes, self._contract_no, bounds))
+        
+        self._metrics_cache = {}
+        current_hour = None
+        bounds = bounds.tolist()
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            stats = next(segment_stats) if segment_stats is not None else None
+            hour_key = int(hours[lo])
+            strike = float(strikes[lo])
+            if hour_key == NAT_NS or np.isnan(strike):
+                continue
+            if hour_key != current_hour:
+                # BTC prices and their alignment are shared by all strikes of the hour
+                current_hour = hour_key
+                hour_lo = lo
+                hour_hi = np.searchsorted(hours, hour_key, side='right')
+                btc_hour = self._btc_hour(hour_key, hour_key + HOUR_NS)
+                btc_matches = self._match_btc(self._contract_ts[hour_lo:hour_hi], btc_hour)
+            self._metrics_cache[(hour_key, strike)] = self._segment_metrics(
+                np.arange(lo, hi), btc_hour,
+                btc_matches[lo - hour_lo:hi - hour_lo] if btc_matches is not None else None,
+                stats
+            )
+        self._metrics_sources = (contract_prices, btc_prices)
+        
+        if cache_key is not None:
+            self._save_metrics_cache(cache_key)
+    
+    def _metrics_cache_key(self) -> str:
+        """Hash of the prepared price arrays that the precomputed metrics depend on."""
+        # The compiled kernel rounds differently, so it is part of the key
+        uses_kernel = NUMBA_AVAILABLE and len(self._contract_hours) >= JIT_MIN_TICKS
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"v{METRICS_CACHE_VERSION}|{uses_kernel}|{self._contract_tz}|{self._btc_tz}".encode())
+        for values in (self._contract_hours, self._contract_ts, self._contract_strikes,
+                       self._contract_yes, self._contract_no, self._btc_ts, self._btc_price):
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.hexdigest()
+    
+    def _load_metrics_cache(self, key: str) -> Optional[Dict[Tuple[int, float], Dict[str, float]]]:
+        """
+        Load precomputed metrics from the disk cache.
+        
+        Args:
+            key: Cache key from _metrics_cache_key
+            
+        Returns:
+            Metrics keyed by (hour start in ns, strike), or None on a cache miss
+        """
+        path = os.path.join(self.metrics_cache_dir, f"{key}.npz")
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                columns = [data[name].tolist() for name in ('hour', 'strike') + METRIC_NAMES]
+        except (OSError, ValueError, KeyError):
+            # Unreadable entry: recompute and overwrite it
+            return None
+        
+        self._touch_metrics_cache(key)
+        return {
+            (hour, strike): dict(zip(METRIC_NAMES, values))
+            for hour, strike, *values in zip(*columns)
+        }
+    
+    def _save_metrics_cache(self, key: str):
+        """
+        Write the precomputed metrics to the disk cache.
+        
+        Args:
+            key: Cache key from _metrics_cache_key
+        """
+        os.makedirs(self.metrics_cache_dir, exist_ok=True)
+        entries = self._metrics_cache
+        np.savez(
+            os.path.join(self.metrics_cache_dir, f"{key}.npz"),
+            hour=np.array([hour for hour, _ in entries], dtype=np.int64),
+            strike=np.array([strike for _, strike in entries], dtype=np.float64),
+            **{name: np.array([metrics[name] for metrics in entries.values()], dtype=np.float64)
+               for name in METRIC_NAMES}
+        )
+        self._touch_metrics_cache(key)
+    
+    def _touch_metrics_cache(self, key: str):
+        """
+        Count a use of a disk cache entry and evict the least frequently used ones.
+        
+        Args:
+            key: Cache key from _metrics_cache_key
+        """
+        meta_path = os.path.join(self.metrics_cache_dir, 'meta.json')
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        
+        entry = meta.setdefault(key, {'hits': 0, 'last_used': 0.0})
+        entry['hits'] += 1
+        entry['last_used'] = time.time()
+        
+        # Evict by fewest hits, oldest use first
+        while len(meta) > METRICS_CACHE_MAX_ENTRIES:
+            victim = min(meta, key=lambda k: (meta[k]['hits'], meta[k]['last_used']))
+            del meta[victim]
+            try:
+                os.remove(os.path.join(self.metrics_cache_dir, f"{victim}.npz"))
+            except OSError:
+                pass
+        
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+    
+    def _lookup_hour_metrics(self,
+                             hour_start: pd.Timestamp,
+                             strikes: List[float],
+                             contract_prices: pd.DataFrame,
+                             btc_prices: pd.DataFrame) -> Dict[float, Dict[str, float]]:
+        """
+        Get market metrics for several strikes of one hour from the precomputed table.
+        
+        Strikes missing from the table, and windows that do not start on the
+        hour, are calculated on demand.
+        
+        Args:
+            hour_start: Start of the trading hour
+            strikes: Strike prices to analyze
+            contract_prices: DataFrame with contract prices
+            btc_prices: DataFrame with BTC prices
+            
+        Returns:
+            Dictionary mapping each strike to its metrics
+        """
+        hour_key = pd.Timestamp(hour_start).value
+        if hour_key % HOUR_NS != 0:
+            return self._calculate_hour_metrics(hour_start, strikes, contract_prices, btc_prices)
+        
+        sources = self._metrics_sources
+        if sources is None or sources[0] is not contract_prices or sources[1] is not btc_prices:
+            self.precompute_metrics(contract_prices, btc_prices)
+        
+        metrics = {}
+        missing = []
+        for strike in strikes:
+            cached = self._metrics_cache.get((hour_key, strike))
+            if cached is None:
+                missing.append(strike)
+            else:
+                metrics[strike] = cached
+        if missing:
+            metrics.update(self._calculate_hour_metrics(hour_start, missing, contract_prices, btc_prices))
+        return metrics
+    
+    def _prepare(self, contract_prices: pd.DataFrame, btc_prices: pd.DataFrame):
+        """
+        Copy the price columns into contiguous arrays, once per DataFrame.
+        
+        Contract rows are stably sorted by (hour, strike), so every hour and
+        every (hour, strike) is a contiguous range that keeps frame order.
+        
+        Args:
+            contract_prices: DataFrame with contract prices
+            btc_prices: DataFrame with BTC prices (indexed by timestamp)
+        """
+        if contract_prices is not self._contracts_source:
+            times = pd.DatetimeIndex(contract_prices['timestamp']).as_unit('ns')
+            ts = times.asi8
+            # Hours are whole UTC hours, matching the start % HOUR_NS checks
+            hours = np.where(ts == NAT_NS, NAT_NS, ts - ts % HOUR_NS)
+            strikes = contract_prices['strike_price'].to_numpy(dtype=np.float64)
+            order = np.lexsort((strikes, hours))
+            
+            self._contract_order = order
+            self._contract_hours = hours[order]
+            self._contract_ts = ts[order]
+            self._contract_strikes = strikes[order]
+            self._contract_yes = contract_prices['yes_price'].to_numpy(dtype=np.float64)[order]
+            self._contract_no = contract_prices['no_price'].to_numpy(dtype=np.float64)[order]
+            self._contract_tz = times.tz
+            self._contracts_source = contract_prices
+        
+        if btc_prices is not self._btc_arrays_source:
+            times = pd.DatetimeIndex(btc_prices.index).as_unit('ns')
+            self._btc_ts = times.asi8
+            self._btc_price = btc_prices['price'].to_numpy(dtype=np.float64)
+            self._btc_sorted = times.is_monotonic_increasing
+            self._btc_tz = times.tz
+            self._btc_arrays_source = btc_prices
+    
+    def _btc_hour(self, start: int, end: int) -> _BtcHour:
+        """BTC prices with start <= timestamp < end (int64 ns), in time order."""
+        if self._btc_sorted:
+            lo = np.searchsorted(self._btc_ts, start, side='left')
+            hi = np.searchsorted(self._btc_ts, end, side='left')
+            rows = np.arange(lo, hi)
+        else:
+            rows = np.flatnonzero((self._btc_ts >= start) & (self._btc_ts < end))
+        times = self._btc_ts[rows]
+        prices = self._btc_price[rows]
+        if not np.all(times[1:] > times[:-1]):
+            # Unsorted or duplicated timestamps: keep the first row of each
+            times, first = np.unique(times, return_index=True)
+            prices = prices[first]
+        return _BtcHour(
+            times=times,
+            prices=prices,
+            comparable=(self._contract_tz is None) == (self._btc_tz is None)
+        )
+    
+    def _match_btc(self, contract_times: np.ndarray, btc_hour: _BtcHour) -> Optional[np.ndarray]:
+        """
+        Find each contract timestamp among the hour's BTC timestamps.
+        
+        One binary search covers every strike of the hour.
+        
+        Args:
+            contract_times: int64 ns contract timestamps
+            btc_hour: BTC prices of the hour, from _btc_hour
+            
+        Returns:
+            Position in btc_hour of each timestamp (-1 if absent), or None when
+            only one side is timezone-aware and no timestamps can match
+        """
+        if not btc_hour.comparable:
+            return None
+        positions = np.searchsorted(btc_hour.times, contract_times)
+        found = positions < len(btc_hour.times)
+        found[found] = btc_hour.times[positions[found]] == contract_times[found]
+        return np.where(found, positions, -1)
+    
+    def _calculate_price_reaction(self,
+                                  segment: np.ndarray,
+                                  btc_hour: _BtcHour,
+                                  btc_matches: Optional[np.ndarray]) -> float:
+        """
+        Absolute correlation between BTC and YES price changes over one hour.
+        
+        Args:
+            segment: Positions of the strike's rows in the prepared contract arrays
+            btc_hour: BTC prices of the hour, from _btc_hour
+            btc_matches: Matching positions in btc_hour for the segment rows (see _match_btc)
+            
+        Returns:
+            Price reaction score (0 if it cannot be computed)
+        """
+        if btc_matches is None:
+            return 0.0
+        
+        yes = self._contract_yes[segment]
+        contract_times = self._contract_ts[segment]
+        if not np.all(contract_times[1:] > contract_times[:-1]):
+            # Unsorted or duplicated timestamps: keep the first row of each
+            _, first = np.unique(contract_times, return_index=True)
+            yes = yes[first]
+            btc_matches = btc_matches[first]
+        
+        # Timestamps present in both series, in time order
+        common = np.flatnonzero(btc_matches >= 0)
+        if len(common) < 2:
+            return 0.0
+        
+        # Higher absolute correlation = more reactive
+        return float(_change_correlation(btc_hour.prices[btc_matches[common]], yes[common]))
+    
     def _estimate_volatility(self, btc_prices: pd.DataFrame, lookback_hours: int = 24) -> float:
         """
         Estimate BTC price volatility based on recent price movements.
         
+        The estimate only depends on the tail of btc_prices, so it is computed
+        once per DataFrame and lookback and reused for every hour.
+        
         Args:
             btc_prices: DataFrame with BTC prices
             lookback_hours: Number of hours to look back (default: 24)
@@ -130,6 +652,18 @@ class MarketSelector:
         Returns:
             Volatility estimate (standard deviation of returns)
         """
+        if btc_prices is not self._volatility_source:
+            self._volatility_source = btc_prices
+            self._volatility_cache = {}
+        
+        volatility = self._volatility_cache.get(lookback_hours)
+        if volatility is None:
+            volatility = self._compute_volatility(btc_prices, lookback_hours)
+            self._volatility_cache[lookback_hours] = volatility
+        return volatility
+    
+    def _compute_volatility(self, btc_prices: pd.DataFrame, lookback_hours: int) -> float:
+        """Standard deviation of returns over the last lookback_hours of btc_prices."""
         if len(btc_prices) < 2:
             return 0.02  # Default volatility
         
@@ -168,9 +702,9 @@ class MarketSelector:
            - Higher volume (higher volume_proxy)
            - Better price reaction (higher price_reaction)
         
-        Note:
-            A volatility estimate is computed and logged for analysis, but it does not
-            currently influence the strike selection logic.
+        Strikes too far from spot to be worth trading this hour are pruned
+        before scoring (see _prune_strikes); the volatility estimate only
+        widens that window and is otherwise logged for analysis.
         
         Args:
             hour_start: Start of the trading hour
@@ -189,97 +723,130 @@ class MarketSelector:
         # Estimate current volatility
         volatility = self._estimate_volatility(btc_prices)
         
-        # Calculate metrics for each strike
-        strike_metrics = []
-        for strike in available_strikes:
-            metrics = self._calculate_market_metrics(
-                hour_start, strike, contract_prices, btc_prices
-            )
-            metrics['strike_price'] = strike
-            strike_metrics.append(metrics)
+        # Only score strikes near spot; the closest strike always survives
+        candidates = self._prune_strikes(btc_spot_price, available_strikes, volatility)
         
-        # Convert to DataFrame for easier analysis
-        metrics_df = pd.DataFrame(strike_metrics)
+        # Look up metrics for each strike, precomputed for the whole dataset
+        hour_metrics = self._lookup_hour_metrics(
+            hour_start, candidates, contract_prices, btc_prices
+        )
+        spreads = np.array([hour_metrics[s]['avg_spread'] for s in candidates], dtype=np.float64)
+        volumes = np.array([hour_metrics[s]['volume_proxy'] for s in candidates], dtype=np.float64)
+        reactions = np.array([hour_metrics[s]['price_reaction'] for s in candidates], dtype=np.float64)
+        strikes = np.array(candidates, dtype=np.float64)
         
-        # Filter out low-liquidity markets and create a copy to avoid SettingWithCopyWarning
-        liquid_markets = metrics_df[metrics_df['volume_proxy'] >= min_volume_threshold].copy()
+        # Filter out low-liquidity markets
+        liquid = np.flatnonzero(volumes >= min_volume_threshold)
         
-        if liquid_markets.empty:
+        if len(liquid) == 0:
             # Fallback to closest strike if no liquid markets
-            selected_strike = min(available_strikes, key=lambda x: abs(x - btc_spot_price))
-            selected_metrics = metrics_df[metrics_df['strike_price'] == selected_strike].iloc[0]
+            selected_strike = self.select_closest_strike(btc_spot_price, candidates)
+            i = int(np.flatnonzero(strikes == selected_strike)[0])
             
             return {
                 'strike_price': selected_strike,
                 'method': 'fallback_closest',
                 'reason': 'No liquid markets found, using closest strike',
-                'metrics': selected_metrics.to_dict()
+                'metrics': {
+                    'avg_spread': float(spreads[i]),
+                    'volume_proxy': float(volumes[i]),
+                    'price_reaction': float(reactions[i]),
+                    'strike_price': float(strikes[i])
+                }
             }
         
+        spreads = spreads[liquid]
+        volumes = volumes[liquid]
+        reactions = reactions[liquid]
+        
         # Score each liquid market
         # Lower spread is better, higher volume is better, higher reaction is better
         
-        # Normalize metrics (0-1 scale)
-        spread_max = liquid_markets['avg_spread'].max()
-        spread_min = liquid_markets['avg_spread'].min()
+        # Normalize metrics (0-1 scale); fmax/fmin skip NaN spreads like Series.max/min
+        spread_max = np.fmax.reduce(spreads)
+        spread_min = np.fmin.reduce(spreads)
         if spread_max > spread_min:
             # Min-max normalization where lower spread is better
-            liquid_markets.loc[:, 'spread_score'] = 1 - (
-                (liquid_markets['avg_spread'] - spread_min) / (spread_max - spread_min)
-            )
+            spread_scores = 1 - ((spreads - spread_min) / (spread_max - spread_min))
         else:
             # All spreads are equal (including all-zero); treat them as equally good
-            liquid_markets.loc[:, 'spread_score'] = 1.0
+            spread_scores = np.full(len(liquid), 1.0)
         
-        max_volume = liquid_markets['volume_proxy'].max()
-        min_volume = liquid_markets['volume_proxy'].min()
+        max_volume = volumes.max()
+        min_volume = volumes.min()
         if max_volume > 0:
             if max_volume == min_volume:
                 # All volumes equal and positive: assign neutral score for fairness
-                liquid_markets.loc[:, 'volume_score'] = 0.5
+                volume_scores = np.full(len(liquid), 0.5)
             else:
-                liquid_markets.loc[:, 'volume_score'] = (
-                    liquid_markets['volume_proxy'] / max_volume
-                )
+                volume_scores = volumes / max_volume
         else:
             # Non-positive volumes: assign neutral score
-            liquid_markets.loc[:, 'volume_score'] = 0.5
+            volume_scores = np.full(len(liquid), 0.5)
         
-        if liquid_markets['price_reaction'].max() > 0:
-            max_reaction = liquid_markets['price_reaction'].max()
-            min_reaction = liquid_markets['price_reaction'].min()
+        max_reaction = reactions.max()
+        if max_reaction > 0:
+            min_reaction = reactions.min()
             if max_reaction == min_reaction:
                 # All non-zero reactions are equal; assign a neutral score
-                liquid_markets.loc[:, 'reaction_score'] = 0.5
+                reaction_scores = np.full(len(liquid), 0.5)
             else:
-                liquid_markets.loc[:, 'reaction_score'] = (
-                    liquid_markets['price_reaction'] / max_reaction
-                )
+                reaction_scores = reactions / max_reaction
         else:
-            liquid_markets.loc[:, 'reaction_score'] = 0.5
+            reaction_scores = np.full(len(liquid), 0.5)
         
         # Combine scores (weighted average)
         # Spread: 40%, Volume: 30%, Reaction: 30%
-        liquid_markets.loc[:, 'total_score'] = (
-            0.4 * liquid_markets['spread_score'] +
-            0.3 * liquid_markets['volume_score'] +
-            0.3 * liquid_markets['reaction_score']
-        )
+        total_scores = 0.4 * spread_scores + 0.3 * volume_scores + 0.3 * reaction_scores
         
-        # Select the strike with highest total score
-        best_market = liquid_markets.loc[liquid_markets['total_score'].idxmax()]
+        # Select the strike with highest total score (first one on ties, NaN never wins)
+        best = int(np.where(np.isnan(total_scores), -np.inf, total_scores).argmax())
+        best_market = {
+            'avg_spread': float(spreads[best]),
+            'volume_proxy': float(volumes[best]),
+            'price_reaction': float(reactions[best]),
+            'strike_price': float(strikes[liquid[best]]),
+            'spread_score': float(spread_scores[best]),
+            'volume_score': float(volume_scores[best]),
+            'reaction_score': float(reaction_scores[best]),
+            'total_score': float(total_scores[best])
+        }
         
         return {
-            'strike_price': best_market['strike_price'],
+            'strike_price': strikes[liquid[best]],
             'method': 'intelligent_selection',
             'reason': f"Best score: spread={best_market['spread_score']:.2f}, volume={best_market['volume_score']:.2f}, reaction={best_market['reaction_score']:.2f}",
-            'metrics': best_market.to_dict(),
+            'metrics': best_market,
             'volatility': volatility,
             'num_strikes_considered': len(available_strikes),
-            'num_liquid_strikes': len(liquid_markets)
+            'num_liquid_strikes': len(liquid)
         }
     
-    def select_closest_strike(self, btc_spot_price: float, available_strikes: list[float]) -> float:
+    def _prune_strikes(self,
+                       btc_spot_price: float,
+                       available_strikes: Sequence[float],
+                       volatility: float) -> List[float]:
+        """
+        Drop strikes too far from spot to be selected this hour.
+        
+        Args:
+            btc_spot_price: Current BTC spot price
+            available_strikes: List of available strike prices
+            volatility: Volatility estimate (standard deviation of returns)
+            
+        Returns:
+            Strikes within reach of spot, in their original order; the
+            PRUNE_FALLBACK_STRIKES nearest strikes if none are
+        """
+        distances = np.abs(np.asarray(available_strikes, dtype=np.float64) - btc_spot_price)
+        max_distance = max(PRUNE_INTERVALS * self.btc_price_interval,
+                           PRUNE_VOLATILITY_MULTIPLE * volatility * btc_spot_price)
+        keep = np.flatnonzero(distances <= max_distance)
+        if len(keep) == 0:
+            keep = np.sort(np.argsort(distances, kind='stable')[:PRUNE_FALLBACK_STRIKES])
+        return [available_strikes[i] for i in keep.tolist()]
+    
+    def select_closest_strike(self, btc_spot_price: float, available_strikes: Sequence[float]) -> float:
         """
         Select the closest strike price to the current BTC spot price.
         
@@ -289,7 +856,7 @@ class MarketSelector:
         
         Args:
             btc_spot_price: Current BTC spot price at hour start
-            available_strikes: List of available strike prices
+            available_strikes: List or array of available strike prices
             
         Returns:
             Closest strike price
@@ -297,12 +864,62 @@ class MarketSelector:
         Raises:
             ValueError: If no strikes available
         """
-        if not available_strikes:
+        if len(available_strikes) == 0:
             raise ValueError("No available strikes to select from")
         
-        # Find the strike with minimum absolute difference
-        closest_strike = min(available_strikes, key=lambda x: abs(x - btc_spot_price))
-        return closest_strike
+        # Find the strike with minimum absolute difference in one vectorized pass;
+        # argmin returns the first match, so ties resolve as before
+        distances = np.abs(np.asarray(available_strikes, dtype=np.float64) - btc_spot_price)
+        return available_strikes[int(distances.argmin())]
+    
+    def set_markets(self, markets_df: pd.DataFrame):
+        """
+        Index markets by hour and by (hour, strike) in one pass.
+        
+        Args:
+            markets_df: DataFrame of available markets
+        """
+        self._markets_source = markets_df
+        
+        strikes = markets_df['strike_price'].to_numpy()
+        starts = markets_df['hour_start']
+        ends = markets_df['hour_end']
+        
+        # Strikes keep their file order within each hour
+        self._hour_strikes = {}
+        self._market_rows = {}
+        for hour, rows in starts.groupby(starts, sort=False).indices.items():
+            hour_key = pd.Timestamp(hour).value
+            hour_strikes = strikes[rows].tolist()
+            self._hour_strikes[hour_key] = hour_strikes
+            for strike, start, end in zip(hour_strikes, starts.iloc[rows].tolist(), ends.iloc[rows].tolist()):
+                # First row wins when a strike is listed twice for an hour
+                self._market_rows.setdefault((hour_key, strike), (start, end))
+    
+    def precompute(self, markets_df: pd.DataFrame, btc_prices_df: pd.DataFrame):
+        """
+        Index markets and hour-start spot prices by hour.
+        
+        get_market_for_hour calls this automatically whenever it is given
+        different DataFrames than last time, so it only runs once per backtest.
+        
+        Args:
+            markets_df: DataFrame of available markets
+            btc_prices_df: DataFrame with BTC prices (indexed by timestamp)
+        """
+        if markets_df is not self._markets_source:
+            self.set_markets(markets_df)
+        self._btc_source = btc_prices_df
+        
+        # Spot price at each hour start, for hours present in the BTC data
+        self._spot_by_hour = {}
+        if btc_prices_df.index.is_unique:
+            hours = pd.DatetimeIndex([pd.Timestamp(h) for h in self._hour_strikes])
+            positions = btc_prices_df.index.get_indexer(hours)
+            prices = btc_prices_df['price'].to_numpy()
+            for hour, pos in zip(hours, positions):
+                if pos >= 0:
+                    self._spot_by_hour[hour.value] = prices[pos]
     
     def get_market_for_hour(self, 
                            hour_start: pd.Timestamp,
@@ -329,21 +946,39 @@ class MarketSelector:
             Dictionary with market info: {hour_start, hour_end, strike_price, btc_spot_price}
             Returns None if no market found or no BTC price at hour start
         """
+        if markets_df is not self._markets_source or btc_prices_df is not self._btc_source:
+            self.precompute(markets_df, btc_prices_df)
+        hour_key = pd.Timestamp(hour_start).value
+        
+        sources = self._selection_sources
+        if (sources is None or sources[0] is not markets_df or sources[1] is not btc_prices_df
+                or sources[2] is not contract_prices_df):
+            self._selection_sources = (markets_df, btc_prices_df, contract_prices_df)
+            self._selection_cache = {}
+        cached = self._selection_cache.get((hour_key, use_intelligent_selection))
+        if cached is not None:
+            # Same data, same selection: log it again as a fresh selection would be
+            market, btc_spot_price, selection_result = cached
+            self._log_selection(hour_start=hour_start, btc_spot_price=btc_spot_price,
+                                selection_result=selection_result)
+            return dict(market)
+        
         # Get BTC spot price at hour start
-        if hour_start not in btc_prices_df.index:
+        if not btc_prices_df.index.is_unique:
+            if hour_start not in btc_prices_df.index:
+                return None
+            btc_spot_price = btc_prices_df.loc[hour_start, 'price']
+        elif hour_key in self._spot_by_hour:
+            btc_spot_price = self._spot_by_hour[hour_key]
+        else:
             return None
         
-        btc_spot_price = btc_prices_df.loc[hour_start, 'price']
-        
-        # Filter markets for this specific hour
-        hour_markets = markets_df[markets_df['hour_start'] == hour_start]
+        # Get available strikes for this specific hour
+        available_strikes = self._hour_strikes.get(hour_key)
         
-        if hour_markets.empty:
+        if available_strikes is None:
             return None
         
-        # Get available strikes
-        available_strikes = hour_markets['strike_price'].tolist()
-        
         # Select strike
         if use_intelligent_selection and contract_prices_df is not None:
             # Use intelligent selection
@@ -356,39 +991,37 @@ class MarketSelector:
             )
             selected_strike = selection_result['strike_price']
             
-            # Log the selection
-            self._log_selection(
-                hour_start=hour_start,
-                btc_spot_price=btc_spot_price,
-                selection_result=selection_result
-            )
         else:
             # Fallback to closest strike
             selected_strike = self.select_closest_strike(btc_spot_price, available_strikes)
-            
-            # Log the fallback selection
-            self._log_selection(
-                hour_start=hour_start,
-                btc_spot_price=btc_spot_price,
-                selection_result={
-                    'strike_price': selected_strike,
-                    'method': 'closest_strike',
-                    'reason': 'Intelligent selection disabled or no contract prices',
-                    'metrics': {},
-                    'volatility': 0.0,
-                    'num_strikes_considered': len(available_strikes)
-                }
-            )
+            selection_result = {
+                'strike_price': selected_strike,
+                'method': 'closest_strike',
+                'reason': 'Intelligent selection disabled or no contract prices',
+                'metrics': {},
+                'volatility': 0.0,
+                'num_strikes_considered': len(available_strikes)
+            }
+        
+        # Log the selection
+        self._log_selection(
+            hour_start=hour_start,
+            btc_spot_price=btc_spot_price,
+            selection_result=selection_result
+        )
         
         # Get the selected market
-        selected_market = hour_markets[hour_markets['strike_price'] == selected_strike].iloc[0]
+        market_start, market_end = self._market_rows[(hour_key, selected_strike)]
         
-        return {
-            'hour_start': selected_market['hour_start'],
-            'hour_end': selected_market['hour_end'],
+        market = {
+            'hour_start': market_start,
+            'hour_end': market_end,
             'strike_price': selected_strike,
             'btc_spot_price': btc_spot_price
         }
+        self._selection_cache[(hour_key, use_intelligent_selection)] = (market, btc_spot_price, selection_result)
+        
+        return dict(market)
     
     def _log_selection(self, hour_start: pd.Timestamp, btc_spot_price: float, selection_result: Dict):
         """Log market selection to CSV file."""
@@ -408,20 +1041,43 @@ class MarketSelector:
             selection_result.get('reason', '')
         ]
         
-        # Append to log file
-        with open(self.log_path, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(log_entry)
+        # Append to log file, creating it on first use (buffered; see flush/close)
+        if self._log_writer is None:
+            if not self._log_initialized:
+                self._init_log_file()
+            else:
+                self._log_file = open(self.log_path, 'a', newline='', buffering=1 << 20)
+                self._log_writer = csv.writer(self._log_file)
+        self._log_writer.writerow(log_entry)
         
         # Also keep in memory for analysis
-        self.selection_log.append({
-            'hour_start': hour_start,
-            'btc_spot_price': btc_spot_price,
-            'selected_strike': selection_result['strike_price'],
-            'method': selection_result.get('method', 'unknown'),
-            'metrics': metrics,
-            'volatility': volatility
-        })
+        self._log_hours.append(hour_start)
+        self._log_spots.append(btc_spot_price)
+        self._log_strikes.append(log_entry[2])
+        self._log_methods.append(log_entry[3])
+        self._log_metrics.append(metrics)
+        self._log_spreads.append(log_entry[4])
+        self._log_volumes.append(log_entry[5])
+        self._log_reactions.append(log_entry[6])
+        self._log_volatilities.append(volatility)
+    
+    @property
+    def selection_log(self) -> List[Dict]:
+        """In-memory selection log as one dictionary per selection."""
+        return [
+            {
+                'hour_start': hour_start,
+                'btc_spot_price': btc_spot_price,
+                'selected_strike': selected_strike,
+                'method': method,
+                'metrics': metrics,
+                'volatility': volatility
+            }
+            for hour_start, btc_spot_price, selected_strike, method, metrics, volatility in zip(
+                self._log_hours, self._log_spots, self._log_strikes,
+                self._log_methods, self._log_metrics, self._log_volatilities
+            )
+        ]
     
     def get_selection_summary(self) -> pd.DataFrame:
         """
@@ -430,28 +1086,20 @@ class MarketSelector:
         Returns:
             DataFrame with selection summary
         """
-        if not self.selection_log:
+        if not self._log_methods:
             return pd.DataFrame()
         
-        # Extract metrics from in-memory log
-        spreads = []
-        volumes = []
-        reactions = []
-        volatilities = []
-        
-        for entry in self.selection_log:
-            metrics = entry.get('metrics', {})
-            spreads.append(metrics.get('avg_spread', 0.0))
-            volumes.append(metrics.get('volume_proxy', 0.0))
-            reactions.append(metrics.get('price_reaction', 0.0))
-            volatilities.append(entry.get('volatility', 0.0))
+        spreads = self._log_spreads
+        volumes = self._log_volumes
+        reactions = self._log_reactions
+        volatilities = self._log_volatilities
         
         # Count intelligent vs fallback selections
-        intelligent_count = sum(1 for entry in self.selection_log if entry.get('method') == 'intelligent_selection')
-        fallback_count = len(self.selection_log) - intelligent_count
+        intelligent_count = self._log_methods.count('intelligent_selection')
+        fallback_count = len(self._log_methods) - intelligent_count
         
         summary = {
-            'total_selections': len(self.selection_log),
+            'total_selections': len(self._log_methods),
             'intelligent_selections': intelligent_count,
             'fallback_selections': fallback_count,
             'avg_spread': np.mean(spreads) if spreads else 0.0,
@@ -476,8 +1124,10 @@ class MarketSelector:
         # Round to nearest strike interval
         base_strike = round(price / self.btc_price_interval) * self.btc_price_interval
         
-        strikes = []
-        for i in range(-num_strikes, num_strikes + 1):
-            strikes.append(base_strike + i * self.btc_price_interval)
+        # Offsets are ascending, so the result needs no sort
+        offsets = self._strike_offsets.get(num_strikes)
+        if offsets is None:
+            offsets = np.arange(-num_strikes, num_strikes + 1) * self.btc_price_interval
+            self._strike_offsets[num_strikes] = offsets
         
-        return sorted(strikes)
+        return (base_strike + offsets).tolist()
@@ -2,7 +2,57 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from .numba_compat import NUMBA_AVAILABLE, njit
+from .time_utils import NAT_NS, datetime_ns
+
+# Below this many trades across all results, process start-up outweighs parallel metrics
+PARALLEL_MIN_TRADES = 200_000
+
+# Below this many resolved trades the NumPy reductions beat JIT dispatch
+JIT_MIN_TRADES = 10_000
+
+
+@njit(cache=True)
+def _pnl_stats_kernel(pnl):
+    """Fused single pass behind _pnl_stats."""
+    wins = 0
+    losses = 0
+    total_sum = 0.0
+    win_sum = 0.0
+    loss_sum = 0.0
+    for i in range(pnl.shape[0]):
+        value = pnl[i]
+        total_sum += value
+        if value > 0:
+            wins += 1
+            win_sum += value
+        elif value < 0:
+            losses += 1
+            loss_sum += value
+    return wins, losses, total_sum, win_sum, loss_sum
+
+
+def _pnl_stats(pnl: np.ndarray) -> Tuple[int, int, float, float, float]:
+    """
+    Win count, loss count and the sums of all, winning and losing PnL.
+    
+    Large histories use one compiled pass; its sequential sums can differ
+    from NumPy's pairwise sums in the last bits.
+    """
+    if NUMBA_AVAILABLE and len(pnl) >= JIT_MIN_TRADES:
+        wins, losses, total_sum, win_sum, loss_sum = _pnl_stats_kernel(pnl)
+        return int(wins), int(losses), float(total_sum), float(win_sum), float(loss_sum)
+    
+    is_win = pnl > 0
+    is_loss = pnl < 0
+    return (int(is_win.sum()), int(is_loss.sum()), pnl.sum(),
+            pnl[is_win].sum(), pnl[is_loss].sum())
 
 
 class MetricsCalculator:
@@ -38,36 +88,35 @@ class MetricsCalculator:
         
         # Calculate trade-level metrics
         if portfolio.pnl_history:
-            pnl_df = pd.DataFrame(portfolio.pnl_history)
+            pnl = portfolio.pnl_array()
+            wins, losses, total_sum, win_sum, loss_sum = _pnl_stats(pnl)
             
             # Win rate
-            wins = (pnl_df['pnl'] > 0).sum()
-            total_trades = len(pnl_df)
+            total_trades = len(pnl)
             metrics['win_rate'] = (wins / total_trades * 100) if total_trades > 0 else 0
             metrics['total_trades'] = total_trades
             metrics['wins'] = wins
             metrics['losses'] = total_trades - wins
             
             # Average trade PnL
-            metrics['avg_trade_pnl'] = pnl_df['pnl'].mean()
-            metrics['avg_win'] = pnl_df[pnl_df['pnl'] > 0]['pnl'].mean() if wins > 0 else 0
-            metrics['avg_loss'] = pnl_df[pnl_df['pnl'] < 0]['pnl'].mean() if (total_trades - wins) > 0 else 0
+            metrics['avg_trade_pnl'] = total_sum / total_trades
+            metrics['avg_win'] = win_sum / wins if wins > 0 else 0
+            if (total_trades - wins) > 0:
+                # NaN when the non-winning trades all broke even, as with an empty Series mean
+                metrics['avg_loss'] = loss_sum / losses if losses > 0 else np.nan
+            else:
+                metrics['avg_loss'] = 0
             
             # Calculate trade duration
-            if portfolio.trade_history:
-                trade_df = pd.DataFrame(portfolio.trade_history)
-
-                # Derive average trade duration from entry and exit timestamps if available
-                if 'entry_timestamp' in trade_df.columns and 'exit_timestamp' in trade_df.columns:
-                    entry_times = pd.to_datetime(trade_df['entry_timestamp'])
-                    exit_times = pd.to_datetime(trade_df['exit_timestamp'])
-                    durations = (exit_times - entry_times).dt.total_seconds() / 60.0
-                    metrics['avg_trade_duration_minutes'] = float(durations.mean()) if len(durations) > 0 else 0
-                else:
-                    # If we do not have both timestamps, we cannot compute a reliable duration
-                    metrics['avg_trade_duration_minutes'] = 0
-            else:
-                metrics['avg_trade_duration_minutes'] = 0
+            # Each resolved position records both its entry and exit timestamp;
+            # trade_history only has entries, so durations come from pnl_history
+            history = portfolio.pnl_history
+            entry_ns = datetime_ns(history.column('entry_timestamp'))
+            exit_ns = datetime_ns(history.column('exit_timestamp'))
+            valid = (entry_ns != NAT_NS) & (exit_ns != NAT_NS)
+            durations = (exit_ns[valid] - entry_ns[valid]) / 1e9 / 60.0
+            # NaN when no trade has both timestamps, like the mean of an all-NaT column
+            metrics['avg_trade_duration_minutes'] = float(durations.mean()) if len(durations) > 0 else np.nan
         else:
             metrics['win_rate'] = 0
             metrics['total_trades'] = 0
@@ -88,48 +137,57 @@ class MetricsCalculator:
         """
         Calculate maximum drawdown.
         
+        Uses the drawdown the simulator tracked hour by hour when present,
+        otherwise rebuilds the equity curve from hours_traded.
+        
         Args:
             results: Results dictionary from simulator
             
         Returns:
             Maximum drawdown as a percentage
         """
+        if 'max_drawdown' in results:
+            return results['max_drawdown']
+        
         hours = results['hours_traded']
         if not hours:
             return 0.0
         
         # Build equity curve
-        equity = [results['initial_balance']]
-        for hour in hours:
-            equity.append(hour['portfolio_value'])
+        equity = np.empty(len(hours) + 1, dtype=np.float64)
+        equity[0] = results['initial_balance']
+        equity[1:] = np.fromiter((hour['portfolio_value'] for hour in hours),
+                                 dtype=np.float64, count=len(hours))
         
         # Calculate running maximum
         running_max = np.maximum.accumulate(equity)
         
-        # Calculate drawdown at each point
-        drawdown = (equity - running_max) / running_max * 100
+        # Calculate drawdown at each point, reusing the equity buffer
+        drawdown = np.subtract(equity, running_max, out=equity)
+        np.divide(drawdown, running_max, out=drawdown)
+        drawdown *= 100
         
         # Return maximum drawdown (most negative value)
-        return abs(min(drawdown))
+        return abs(float(drawdown.min()))
     
     @staticmethod
-    def create_comparison_table(all_results: List[Dict]) -> pd.DataFrame:
+    def create_comparison_table(all_results: List[Dict],
+                                top_n: Optional[int] = None,
+                                metrics_list: Optional[List[Dict]] = None) -> pd.DataFrame:
         """
         Create a comparison table for multiple strategies.
         
         Args:
             all_results: List of results dictionaries from multiple strategies
+            top_n: Keep only the top_n strategies by total PnL (default: all)
+            metrics_list: Metrics already calculated for all_results, in the
+                same order (default: calculated here)
             
         Returns:
             DataFrame with strategy comparison
         """
-        metrics_list = []
-        
-        for result in all_results:
-            metrics = MetricsCalculator.calculate_metrics(result)
-            metrics_list.append(metrics)
-        
-        df = pd.DataFrame(metrics_list)
+        if metrics_list is None:
+            metrics_list = MetricsCalculator._calculate_all_metrics(all_results)
         
         # Select and order columns
         columns = [
@@ -146,10 +204,65 @@ class MetricsCalculator:
             'num_hours'
         ]
         
-        # Only include columns that exist
-        columns = [col for col in columns if col in df.columns]
+        # Only include columns that exist, built column by column
+        present = set().union(*metrics_list)
+        columns = [col for col in columns if col in present]
+        df = pd.DataFrame({
+            col: [metrics.get(col, np.nan) for metrics in metrics_list]
+            for col in columns
+        })
+        
+        if top_n is not None and 0 < top_n < len(df):
+            # Partition out the top_n rows, then sort only those
+            pnls = df['total_pnl'].to_numpy(dtype=np.float64)
+            top = np.argpartition(pnls, -top_n)[-top_n:]
+            top = top[np.argsort(-pnls[top], kind='stable')]
+            return df.iloc[top]
+        
+        return df.sort_values('total_pnl', ascending=False)
+    
+    @staticmethod
+    def _calculate_all_metrics(all_results: List[Dict]) -> List[Dict]:
+        """
+        Calculate metrics for several results, in worker processes when large.
         
-        return df[columns].sort_values('total_pnl', ascending=False)
+        Args:
+            all_results: List of results dictionaries from multiple strategies
+            
+        Returns:
+            List of metrics dictionaries, in the order of all_results
+        """
+        total_trades = sum(len(result['portfolio'].pnl_history) for result in all_results)
+        workers = min(len(all_results), os.cpu_count() or 1)
+        if workers > 1 and total_trades >= PARALLEL_MIN_TRADES:
+            # Ship only what calculate_metrics reads instead of whole results
+            payloads = [MetricsCalculator._metrics_payload(result) for result in all_results]
+            try:
+                # Spawned, not forked: a fork taken while Numba's worker
+                # threads are running can deadlock in the child
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context('spawn')) as executor:
+                    return list(executor.map(MetricsCalculator.calculate_metrics, payloads))
+            except (OSError, BrokenProcessPool):
+                # No usable process pool here; fall back to the serial loop
+                pass
+        
+        return [MetricsCalculator.calculate_metrics(result) for result in all_results]
+    
+    @staticmethod
+    def _metrics_payload(results: Dict) -> Dict:
+        """Picklable subset of a results dictionary used by calculate_metrics."""
+        payload = {
+            'strategy_name': results['strategy_name'],
+            'total_pnl': results['total_pnl'],
+            'final_balance': results['final_balance'],
+            'initial_balance': results['initial_balance'],
+            'hours_traded': [{'portfolio_value': hour['portfolio_value']} for hour in results['hours_traded']],
+            'portfolio': results['portfolio']
+        }
+        if 'max_drawdown' in results:
+            payload['max_drawdown'] = results['max_drawdown']
+        return payload
     
     @staticmethod
     def print_metrics(metrics: Dict) -> None:
@@ -184,24 +297,26 @@ class MetricsCalculator:
         if not hours:
             return pd.DataFrame()
         
-        hourly_data = []
-        for hour in hours:
-            hourly_data.append({
-                'hour_start': hour['hour_start'],
-                'hour_end': hour['hour_end'],
-                'strike_price': hour['strike_price'],
-                'spot_start': hour['spot_price_start'],
-                'spot_end': hour['final_btc_price'],
-                'trades': hour['trades_executed'],
-                'pnl': hour['hour_pnl'],
-                'portfolio_value': hour['portfolio_value']
-            })
-        
-        df = pd.DataFrame(hourly_data)
+        count = len(hours)
+        
+        def column(key, dtype=np.float64):
+            return np.fromiter((hour[key] for hour in hours), dtype=dtype, count=count)
+        
+        pnl = column('hour_pnl')
+        df = pd.DataFrame({
+            # Timestamps stay as objects so pandas keeps any timezone
+            'hour_start': [hour['hour_start'] for hour in hours],
+            'hour_end': [hour['hour_end'] for hour in hours],
+            'strike_price': column('strike_price'),
+            'spot_start': column('spot_price_start'),
+            'spot_end': column('final_btc_price'),
+            'trades': column('trades_executed', np.int64),
+            'pnl': pnl,
+            'portfolio_value': column('portfolio_value')
+        }, copy=False)
         
         # Add cumulative PnL
-        if not df.empty:
-            df['cumulative_pnl'] = df['pnl'].cumsum()
+        df['cumulative_pnl'] = np.cumsum(pnl)
         
         return df
     
@@ -227,9 +342,9 @@ class MetricsCalculator:
         # Format for display
         display_df = df.copy()
         display_df['hour_start'] = display_df['hour_start'].dt.strftime('%Y-%m-%d %H:%M')
-        display_df['pnl'] = display_df['pnl'].apply(lambda x: f"${x:.2f}")
-        display_df['cumulative_pnl'] = display_df['cumulative_pnl'].apply(lambda x: f"${x:.2f}")
-        display_df['portfolio_value'] = display_df['portfolio_value'].apply(lambda x: f"${x:.2f}")
+        display_df['pnl'] = [f"${x:.2f}" for x in display_df['pnl'].tolist()]
+        display_df['cumulative_pnl'] = [f"${x:.2f}" for x in display_df['cumulative_pnl'].tolist()]
+        display_df['portfolio_value'] = [f"${x:.2f}" for x in display_df['portfolio_value'].tolist()]
         
         # Show first and last rows if too many
         if len(display_df) > max_rows:
@@ -242,14 +357,20 @@ class MetricsCalculator:
         print(f"{'='*80}\n")
     
     @staticmethod
-    def print_strategy_leaderboard(all_results: List[Dict]) -> None:
+    def print_strategy_leaderboard(all_results: List[Dict],
+                                   top_n: Optional[int] = None,
+                                   metrics_list: Optional[List[Dict]] = None) -> None:
         """
         Print strategy leaderboard sorted by total PnL.
         
         Args:
             all_results: List of results dictionaries from multiple strategies
+            top_n: Print only the top_n strategies (default: all)
+            metrics_list: Metrics already calculated for all_results, in the
+                same order (default: calculated here)
         """
-        comparison = MetricsCalculator.create_comparison_table(all_results)
+        comparison = MetricsCalculator.create_comparison_table(all_results, top_n=top_n,
+                                                               metrics_list=metrics_list)
         
         print("\n" + "=" * 100)
         print("STRATEGY LEADERBOARD")
@@ -257,12 +378,12 @@ class MetricsCalculator:
         
         # Format for better display
         display_df = comparison.copy()
-        display_df['total_pnl'] = display_df['total_pnl'].apply(lambda x: f"${x:.2f}")
-        display_df['return_pct'] = display_df['return_pct'].apply(lambda x: f"{x:.2f}%")
-        display_df['final_balance'] = display_df['final_balance'].apply(lambda x: f"${x:.2f}")
-        display_df['win_rate'] = display_df['win_rate'].apply(lambda x: f"{x:.2f}%")
-        display_df['avg_trade_pnl'] = display_df['avg_trade_pnl'].apply(lambda x: f"${x:.2f}")
-        display_df['max_drawdown'] = display_df['max_drawdown'].apply(lambda x: f"{x:.2f}%")
+        display_df['total_pnl'] = [f"${x:.2f}" for x in display_df['total_pnl'].tolist()]
+        display_df['return_pct'] = [f"{x:.2f}%" for x in display_df['return_pct'].tolist()]
+        display_df['final_balance'] = [f"${x:.2f}" for x in display_df['final_balance'].tolist()]
+        display_df['win_rate'] = [f"{x:.2f}%" for x in display_df['win_rate'].tolist()]
+        display_df['avg_trade_pnl'] = [f"${x:.2f}" for x in display_df['avg_trade_pnl'].tolist()]
+        display_df['max_drawdown'] = [f"{x:.2f}%" for x in display_df['max_drawdown'].tolist()]
         
         # Add rank column
         display_df.insert(0, 'rank', range(1, len(display_df) + 1))
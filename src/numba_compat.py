@@ -0,0 +1,23 @@
+"""Optional Numba support.
+
+Numba is not a hard dependency. Modules import ``njit``/``prange`` from here
+and check ``NUMBA_AVAILABLE`` to decide whether to dispatch to a compiled
+kernel or to their NumPy fallback.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels can still be defined."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+    prange = range
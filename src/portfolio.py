@@ -1,14 +1,17 @@
 """Portfolio management for tracking positions and PnL."""
 
 from __future__ import annotations
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, TYPE_CHECKING
+import numpy as np
 import pandas as pd
 
 if TYPE_CHECKING:
     from .market_microstructure import MarketMicrostructure
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents a contract position."""
     contract_type: str  # "YES" or "NO"
@@ -20,6 +23,116 @@ class Position:
     slippage: float = 0.0  # Track slippage incurred per contract
 
 
+# (name, array typecode) per history column; None stores arbitrary objects
+TRADE_COLUMNS = (
+    ('timestamp', None),
+    ('entry_timestamp', None),
+    ('action', None),
+    ('quantity', 'd'),
+    ('price', 'd'),
+    ('fees', 'd'),
+    ('strike_price', 'd'),
+    ('spread_cost', 'd'),
+    ('slippage', 'd'),
+)
+PNL_COLUMNS = (
+    ('timestamp', None),
+    ('entry_time', None),
+    ('exit_timestamp', None),
+    ('entry_timestamp', None),
+    ('contract_type', None),
+    ('quantity', 'd'),
+    ('entry_price', 'd'),
+    ('payout', 'd'),
+    ('pnl', 'd'),
+    ('strike_price', 'd'),
+    ('final_btc_price', 'd'),
+    ('win', None),
+)
+OPEN_POSITION_COLUMNS = (
+    ('contract_type', None),
+    ('entry_time', None),
+    ('quantity', 'd'),
+    ('entry_price', 'd'),
+    ('strike_price', 'd'),
+)
+
+
+class RecordHistory(Sequence):
+    """
+    Append-only trade records stored column by column.
+    
+    Indexing and iteration yield one dict per record, like the list of dicts
+    this replaces; column() and to_frame() read whole fields without
+    building those dicts.
+    """
+    
+    def __init__(self, columns):
+        """
+        Initialize an empty history.
+        
+        Args:
+            columns: (name, typecode) pairs such as TRADE_COLUMNS
+        """
+        self.columns = tuple(name for name, _ in columns)
+        self._data = [array(typecode) if typecode else [] for _, typecode in columns]
+        self._by_name: Dict[str, Sequence] = dict(zip(self.columns, self._data))
+    
+    def append(self, *values) -> None:
+        """Append one record, given as values in column order or as one dict."""
+        if len(values) == 1 and isinstance(values[0], dict):
+            record = values[0]
+            values = tuple(record[name] for name in self.columns)
+        if len(values) != len(self._data):
+            raise TypeError(
+                f"append() takes one value per column ({len(self._data)}), got {len(values)}"
+            )
+        for column, value in zip(self._data, values):
+            column.append(value)
+    
+    def extend(self, *columns) -> None:
+        """Append several records, given as one sequence per column in column order."""
+        if len(columns) != len(self._data):
+            raise TypeError(
+                f"extend() takes one sequence per column ({len(self._data)}), got {len(columns)}"
+            )
+        for column, values in zip(self._data, columns):
+            column.extend(values)
+    
+    def column(self, name: str) -> Sequence:
+        """All values of one field, in record order."""
+        return self._by_name[name]
+    
+    def array(self, name: str, start: int = 0) -> np.ndarray:
+        """
+        Float64 copy of a numeric column from record start onwards.
+        
+        A copy rather than a view: the history cannot grow while a buffer
+        view of one of its columns is alive.
+        """
+        values = self._by_name[name]
+        return np.frombuffer(values, dtype=np.float64, offset=min(start, len(values)) * values.itemsize).copy()
+    
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame with one row per record."""
+        return pd.DataFrame({
+            name: np.array(values, dtype=np.float64) if isinstance(values, array) else values
+            for name, values in self._by_name.items()
+        })
+    
+    def __len__(self) -> int:
+        return len(self._data[0])
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return dict(zip(self.columns, [column[index] for column in self._data]))
+    
+    def __iter__(self):
+        for values in zip(*self._data):
+            yield dict(zip(self.columns, values))
+
+
 class Portfolio:
     """
     Portfolio class that:
@@ -46,8 +159,13 @@ class Portfolio:
         self.fee_per_contract = fee_per_contract
         self.market_microstructure = market_microstructure
         self.positions = []  # List of Position objects
-        self.trade_history = []  # List of all trades
-        self.pnl_history = []  # Track PnL over time
+        # The same open positions, column by column for resolve_positions
+        self._open_positions = RecordHistory(OPEN_POSITION_COLUMNS)
+        self.trade_history = RecordHistory(TRADE_COLUMNS)  # All trades
+        self.pnl_history = RecordHistory(PNL_COLUMNS)  # Track PnL over time
+        # Peak equity and most negative drawdown (%) seen by record_equity
+        self._equity_peak = starting_balance
+        self._worst_drawdown = 0.0
         
     def can_afford(self, quantity: float, price: float) -> bool:
         """
@@ -67,7 +185,7 @@ class Portfolio:
                 quantity: float,
                 price: float,
                 timestamp: pd.Timestamp,
-                strike_price: float) -> bool:
+                strike_price: float) -> Optional[Dict]:
         """
         Buy YES contracts with market microstructure effects.
         
@@ -78,77 +196,15 @@ class Portfolio:
             strike_price: Strike price of the market
             
         Returns:
-            True if trade executed, False if insufficient funds or liquidity
+            The executed trade record, or None if insufficient funds or liquidity
         """
-        # Apply market microstructure if available
-        if self.market_microstructure:
-            execution = self.market_microstructure.execute_trade(
-                timestamp=timestamp,
-                mid_price=price,
-                quantity=quantity,
-                side="buy"
-            )
-            
-            if not execution.executed:
-                return False
-            
-            # Use execution results
-            actual_quantity = execution.quantity_executed
-            actual_price = execution.execution_price
-            spread_cost = execution.spread_cost
-            slippage = execution.slippage
-        else:
-            # No microstructure: use mid price directly
-            actual_quantity = quantity
-            actual_price = price
-            spread_cost = 0.0
-            slippage = 0.0
-        
-        # Check affordability with actual execution price
-        if not self.can_afford(actual_quantity, actual_price):
-            # Roll back liquidity consumption if trade fails
-            if self.market_microstructure:
-                self.market_microstructure.rollback_liquidity(timestamp, actual_quantity)
-            return False
-        
-        # Deduct cost and fees
-        total_cost = actual_quantity * actual_price + actual_quantity * self.fee_per_contract
-        self.cash -= total_cost
-        
-        # Create position
-        position = Position(
-            contract_type="YES",
-            quantity=actual_quantity,
-            entry_price=actual_price,
-            entry_time=timestamp,
-            strike_price=strike_price,
-            spread_cost=spread_cost,
-            slippage=slippage
-        )
-        self.positions.append(position)
-        
-        # Record trade
-        # Note: Both 'timestamp' and 'entry_timestamp' are kept for compatibility
-        # 'entry_timestamp' is used by metrics for duration calculations
-        self.trade_history.append({
-            'timestamp': timestamp,
-            'entry_timestamp': timestamp,
-            'action': 'BUY_YES',
-            'quantity': actual_quantity,
-            'price': actual_price,
-            'fees': actual_quantity * self.fee_per_contract,
-            'strike_price': strike_price,
-            'spread_cost': spread_cost,
-            'slippage': slippage
-        })
-        
-        return True
+        return self._buy("YES", 'BUY_YES', quantity, price, timestamp, strike_price)
     
     def buy_no(self, 
                quantity: float,
                price: float,
                timestamp: pd.Timestamp,
-               strike_price: float) -> bool:
+               strike_price: float) -> Optional[Dict]:
         """
         Buy NO contracts with market microstructure effects.
         
@@ -159,11 +215,35 @@ class Portfolio:
             strike_price: Strike price of the market
             
         Returns:
-            True if trade executed, False if insufficient funds or liquidity
+            The executed trade record, or None if insufficient funds or liquidity
+        """
+        return self._buy("NO", 'BUY_NO', quantity, price, timestamp, strike_price)
+    
+    def _buy(self,
+             contract_type: str,
+             action: str,
+             quantity: float,
+             price: float,
+             timestamp: pd.Timestamp,
+             strike_price: float) -> Optional[Dict]:
+        """
+        Buy contracts of one side; shared body of buy_yes and buy_no.
+        
+        Args:
+            contract_type: "YES" or "NO"
+            action: Trade history action, 'BUY_YES' or 'BUY_NO'
+            quantity: Number of contracts to buy
+            price: Mid-market price per contract
+            timestamp: Time of purchase
+            strike_price: Strike price of the market
+            
+        Returns:
+            The executed trade record, or None if insufficient funds or liquidity
         """
-        # Apply market microstructure if available
+        # Apply market microstructure if available; quote first so a trade we
+        # cannot afford never touches the liquidity book
         if self.market_microstructure:
-            execution = self.market_microstructure.execute_trade(
+            execution = self.market_microstructure.quote_trade(
                 timestamp=timestamp,
                 mid_price=price,
                 quantity=quantity,
@@ -171,7 +251,7 @@ class Portfolio:
             )
             
             if not execution.executed:
-                return False
+                return None
             
             # Use execution results
             actual_quantity = execution.quantity_executed
@@ -187,10 +267,10 @@ class Portfolio:
         
         # Check affordability with actual execution price
         if not self.can_afford(actual_quantity, actual_price):
-            # Roll back liquidity consumption if trade fails
-            if self.market_microstructure:
-                self.market_microstructure.rollback_liquidity(timestamp, actual_quantity)
-            return False
+            return None
+        
+        if self.market_microstructure:
+            self.market_microstructure.consume_liquidity(timestamp, actual_quantity)
         
         # Deduct cost and fees
         total_cost = actual_quantity * actual_price + actual_quantity * self.fee_per_contract
@@ -198,7 +278,7 @@ class Portfolio:
         
         # Create position
         position = Position(
-            contract_type="NO",
+            contract_type=contract_type,
             quantity=actual_quantity,
             entry_price=actual_price,
             entry_time=timestamp,
@@ -207,23 +287,25 @@ class Portfolio:
             slippage=slippage
         )
         self.positions.append(position)
+        self._open_positions.append(contract_type, timestamp, actual_quantity, actual_price, strike_price)
         
-        # Record trade
+        # Record trade (values in TRADE_COLUMNS order) and hand it back to the caller
         # Note: Both 'timestamp' and 'entry_timestamp' are kept for compatibility
         # 'entry_timestamp' is used by metrics for duration calculations
-        self.trade_history.append({
-            'timestamp': timestamp,
-            'entry_timestamp': timestamp,
-            'action': 'BUY_NO',
-            'quantity': actual_quantity,
-            'price': actual_price,
-            'fees': actual_quantity * self.fee_per_contract,
-            'strike_price': strike_price,
-            'spread_cost': spread_cost,
-            'slippage': slippage
-        })
+        trade = (
+            timestamp,
+            timestamp,
+            action,
+            actual_quantity,
+            actual_price,
+            actual_quantity * self.fee_per_contract,
+            strike_price,
+            spread_cost,
+            slippage
+        )
+        self.trade_history.append(*trade)
         
-        return True
+        return dict(zip(self.trade_history.columns, trade))
     
     def resolve_positions(self, 
                          final_btc_price: float,
@@ -238,49 +320,85 @@ class Portfolio:
         Returns:
             Total PnL from position resolution
         """
+        open_positions = self._open_positions
+        count = len(open_positions)
+        if count == 0:
+            self.positions = []
+            return 0.0
+        
+        quantity = np.array(open_positions.column('quantity'), dtype=np.float64)
+        entry_price = np.array(open_positions.column('entry_price'), dtype=np.float64)
+        strike_price = np.array(open_positions.column('strike_price'), dtype=np.float64)
+        is_yes = np.fromiter((contract_type == "YES" for contract_type in open_positions.column('contract_type')),
+                             dtype=bool, count=count)
+        
+        # YES wins at or above the strike, NO strictly below it
+        wins = np.where(is_yes, final_btc_price >= strike_price, final_btc_price < strike_price)
+        
+        # Win pays $1 per contract, loss pays $0
+        payout = np.where(wins, quantity * 1.0, 0.0)
+        
+        # Calculate PnL (payout - cost)
+        pnl = payout - quantity * entry_price
+        
+        # Sum left to right, one position at a time, so cash and PnL round
+        # exactly as when each position was credited separately
+        cash = self.cash
+        for value in payout.tolist():
+            cash += value
         total_pnl = 0.0
+        for value in pnl.tolist():
+            total_pnl += value
         
-        for position in self.positions:
-            # Determine if position wins
-            if position.contract_type == "YES":
-                wins = final_btc_price >= position.strike_price
-            else:  # NO
-                wins = final_btc_price < position.strike_price
-            
-            # Calculate payout
-            if wins:
-                payout = position.quantity * 1.0  # Win pays $1 per contract
-            else:
-                payout = 0.0  # Loss pays $0
-            
-            # Calculate PnL (payout - cost)
-            cost = position.quantity * position.entry_price
-            pnl = payout - cost
-            
-            self.cash += payout
-            total_pnl += pnl
-            
-            # Record resolution
-            self.pnl_history.append({
-                'timestamp': resolution_time,
-                'entry_time': position.entry_time,
-                'exit_timestamp': resolution_time,
-                'entry_timestamp': position.entry_time,
-                'contract_type': position.contract_type,
-                'quantity': position.quantity,
-                'entry_price': position.entry_price,
-                'payout': payout,
-                'pnl': pnl,
-                'strike_price': position.strike_price,
-                'final_btc_price': final_btc_price,
-                'win': wins
-            })
+        # Record resolutions (columns in PNL_COLUMNS order)
+        resolution_times = [resolution_time] * count
+        entry_times = open_positions.column('entry_time')
+        self.pnl_history.extend(
+            resolution_times,
+            entry_times,
+            resolution_times,
+            entry_times,
+            open_positions.column('contract_type'),
+            quantity,
+            entry_price,
+            payout,
+            pnl,
+            strike_price,
+            [final_btc_price] * count,
+            wins.tolist()
+        )
+        
+        # Credit payouts only once the resolutions are on record
+        self.cash = cash
         
         # Clear positions
         self.positions = []
+        self._open_positions = RecordHistory(OPEN_POSITION_COLUMNS)
         
         return total_pnl
     
+    def record_equity(self, value: float) -> None:
+        """
+        Fold an hour-end portfolio value into the running maximum drawdown.
+        
+        Args:
+            value: Portfolio value at the close of the hour
+        """
+        if value > self._equity_peak:
+            self._equity_peak = value
+        drawdown = (value - self._equity_peak) / self._equity_peak * 100
+        if drawdown < self._worst_drawdown:
+            self._worst_drawdown = drawdown
+    
+    @property
+    def max_drawdown_pct(self) -> float:
+        """Maximum drawdown (%) over the values passed to record_equity."""
+        return abs(float(self._worst_drawdown))
+    
+    def pnl_array(self) -> np.ndarray:
+        """Realized PnL per resolved position, as a float64 array."""
+        return self.pnl_history.array('pnl')
+    
     def get_total_value(self) -> float:
         """Get total portfolio value (cash + unrealized positions)."""
         # For unrealized positions, we'd need current market prices
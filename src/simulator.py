@@ -1,7 +1,9 @@
 """Main simulator for paper trading."""
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from .config import SimulationConfig
 from .data_loader import DataLoader
 from .market_selector import MarketSelector
@@ -13,6 +15,34 @@ from .dataset_factory import DatasetFactory
 from .explainability import ExplainabilityEngine
 
 
+# Actions that can be queued, indexed by the code stored in the latency queue
+PENDING_ACTIONS = (TradeAction.BUY_YES, TradeAction.BUY_NO)
+
+
+@dataclass(slots=True)
+class _HourData:
+    """An hour's selected market and prices, shared by every strategy trading it."""
+    hour_start: pd.Timestamp
+    hour_end: pd.Timestamp
+    strike_price: float
+    spot_price_start: float
+    timestamps: pd.DatetimeIndex  # BTC price minutes in the hour
+    btc_prices: np.ndarray
+    contract_by_minute: Dict[int, Tuple[float, float]]  # int64 ns -> (yes, no)
+    final_btc_price: float
+    _tradable: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = field(default=None, init=False, repr=False)
+    
+    def tradable_minutes(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Positions of the minutes with contract prices, and their YES and NO prices (built on first use)."""
+        if self._tradable is None:
+            contract_by_minute = self.contract_by_minute
+            positions = [i for i, minute in enumerate(self.timestamps.asi8.tolist()) if minute in contract_by_minute]
+            prices = [contract_by_minute[minute] for minute in self.timestamps.asi8[positions].tolist()]
+            prices = np.array(prices, dtype=np.float64).reshape(-1, 2)
+            self._tradable = (np.array(positions, dtype=np.intp), prices[:, 0].copy(), prices[:, 1].copy())
+        return self._tradable
+
+
 class Simulator:
     """
     Simulator that:
@@ -39,11 +69,20 @@ class Simulator:
             contract_prices_path=config.contract_prices_path
         )
         self.market_selector = MarketSelector(
-            btc_price_interval=config.btc_price_interval
+            btc_price_interval=config.btc_price_interval,
+            metrics_cache_dir=config.metrics_cache_dir
         )
         self.contract_pricer = ContractPricer()
         self.dataset_factory = None  # Optional dataset collector
         
+        # Loaded (btc_prices, markets, contract_prices) and the config values they
+        # were loaded for; reusing the same frames lets the market selector's
+        # per-DataFrame caches carry over between runs
+        self._data = None
+        self._data_key = None
+        # Per-strike contract prices ordered by time, built with _data
+        self._contract_index: Dict[float, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        
     def run(self, strategy: Strategy, collect_dataset: bool = False) -> Dict:
         """
         Run simulation with a given strategy.
@@ -60,13 +99,81 @@ class Simulator:
             self.dataset_factory = DatasetFactory()
         
         # Load data
-        btc_prices = self.data_loader.load_btc_prices(
-            start_date=self.config.start_date,
-            end_date=self.config.end_date
-        )
-        markets = self.data_loader.load_markets()
-        contract_prices = self.data_loader.load_contract_prices()
+        btc_prices, markets, contract_prices = self._load_data()
+        
+        market_microstructure, portfolio, results = self._start_run(strategy)
         
+        # Loop over each hour
+        for hour_start in self._unique_hours(markets):
+            hour_result = self._simulate_hour(
+                hour_start=hour_start,
+                btc_prices=btc_prices,
+                markets=markets,
+                contract_prices=contract_prices,
+                contract_index=self._contract_index,
+                strategy=strategy,
+                portfolio=portfolio,
+                market_microstructure=market_microstructure
+            )
+            
+            if hour_result:
+                results['hours_traded'].append(hour_result)
+                portfolio.record_equity(hour_result['portfolio_value'])
+        
+        self._finish_run(results, portfolio)
+        
+        # Write out the buffered selection log
+        self.market_selector.flush()
+        
+        return results
+    
+    def run_many(self, strategies: List[Strategy], collect_dataset: bool = False) -> List[Dict]:
+        """
+        Run several strategies side by side over a single pass of the data.
+        
+        Each hour's market, BTC prices and contract prices are looked up once and
+        then replayed to every strategy, each with its own portfolio and market
+        microstructure, so the results match running each strategy with run().
+        The selection log gets one entry per hour rather than one per strategy.
+        
+        Args:
+            strategies: Trading strategies to run
+            collect_dataset: If True, collect ML-ready dataset during simulation
+                (recorded once per minute, alongside the first strategy)
+            
+        Returns:
+            List of simulation results, one per strategy, in the given order
+        """
+        if collect_dataset:
+            self.dataset_factory = DatasetFactory()
+        
+        btc_prices, markets, contract_prices = self._load_data()
+        
+        runs = [self._start_run(strategy) for strategy in strategies]
+        
+        for hour_start in self._unique_hours(markets):
+            for strategy, (market_microstructure, _, _) in zip(strategies, runs):
+                strategy.reset()
+                market_microstructure.reset_hour()
+            
+            hour = self._prepare_hour(hour_start, btc_prices, markets, contract_prices, self._contract_index)
+            if hour is None:
+                continue
+            
+            for i, (strategy, (market_microstructure, portfolio, results)) in enumerate(zip(strategies, runs)):
+                hour_result = self._trade_hour(hour, strategy, portfolio, market_microstructure,
+                                               collect_dataset=(i == 0))
+                results['hours_traded'].append(hour_result)
+                portfolio.record_equity(hour_result['portfolio_value'])
+        
+        for _, portfolio, results in runs:
+            self._finish_run(results, portfolio)
+        self.market_selector.flush()
+        
+        return [results for _, _, results in runs]
+    
+    def _start_run(self, strategy: Strategy) -> Tuple[MarketMicrostructure, Portfolio, Dict]:
+        """Create the market microstructure, portfolio and results for one strategy's run."""
         # Initialize market microstructure
         market_microstructure = MarketMicrostructure(
             bid_ask_spread=self.config.bid_ask_spread,
@@ -82,13 +189,6 @@ class Simulator:
             market_microstructure=market_microstructure
         )
         
-        # Get unique hours to trade
-        unique_hours = markets['hour_start'].unique()
-        unique_hours = sorted(unique_hours)
-        
-        # Initialize explainability engine
-        explainability = ExplainabilityEngine()
-        
         results = {
             'strategy_name': strategy.name,
             'hours_traded': [],
@@ -96,38 +196,83 @@ class Simulator:
             'final_balance': None,
             'total_pnl': None,
             'portfolio': portfolio,
-            'explainability': explainability
+            'explainability': ExplainabilityEngine()
         }
-        
-        # Loop over each hour
-        for hour_start in unique_hours:
-            hour_result = self._simulate_hour(
-                hour_start=hour_start,
-                btc_prices=btc_prices,
-                markets=markets,
-                contract_prices=contract_prices,
-                strategy=strategy,
-                portfolio=portfolio,
-                market_microstructure=market_microstructure
-            )
-            
-            if hour_result:
-                results['hours_traded'].append(hour_result)
-        
-        # Calculate final results
+        return market_microstructure, portfolio, results
+    
+    def _finish_run(self, results: Dict, portfolio: Portfolio) -> None:
+        """Fill in the final balance, PnL and selection summary of a finished run."""
         results['final_balance'] = portfolio.cash
         results['total_pnl'] = portfolio.get_total_pnl()
+        results['max_drawdown'] = portfolio.max_drawdown_pct
         
         # Add market selection summary
         results['market_selection_summary'] = self.market_selector.get_selection_summary()
+    
+    @staticmethod
+    def _unique_hours(markets: pd.DataFrame) -> pd.DatetimeIndex:
+        """Unique hours to trade, sorted in C (markets files are usually in order already)."""
+        unique_hours = pd.DatetimeIndex(markets['hour_start'].unique())
+        if not unique_hours.is_monotonic_increasing:
+            unique_hours = unique_hours.sort_values()
+        return unique_hours
+    
+    def _load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Load BTC prices, markets and contract prices once per configuration.
         
-        return results
+        Returns:
+            Tuple of (btc_prices, markets, contract_prices); the simulation
+            only reads them, so repeated runs share the same frames
+        """
+        key = (
+            self.data_loader.btc_prices_path,
+            self.data_loader.markets_path,
+            self.data_loader.contract_prices_path,
+            self.config.start_date,
+            self.config.end_date
+        )
+        if self._data is None or key != self._data_key:
+            btc_prices = self.data_loader.load_btc_prices(
+                start_date=self.config.start_date,
+                end_date=self.config.end_date
+            )
+            markets = self.data_loader.load_markets()
+            contract_prices = self.data_loader.load_contract_prices()
+            self._data = (btc_prices, markets, contract_prices)
+            self._data_key = key
+            # Per-strike contract prices ordered by time, so each hour is a binary search
+            self._contract_index = self._index_contract_prices(contract_prices)
+        return self._data
+    
+    @staticmethod
+    def _index_contract_prices(
+            contract_prices: pd.DataFrame) -> Dict[float, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Group contract prices by strike as arrays ordered by timestamp.
+        
+        Args:
+            contract_prices: Contract prices with timestamp, strike_price, yes_price and no_price columns
+            
+        Returns:
+            Dictionary of strike -> (sorted int64 ns timestamps, YES prices, NO prices)
+        """
+        timestamps = contract_prices['timestamp'].to_numpy(dtype='datetime64[ns]').view('i8')
+        yes_prices = contract_prices['yes_price'].to_numpy()
+        no_prices = contract_prices['no_price'].to_numpy()
+        index = {}
+        for strike, rows in contract_prices.groupby('strike_price', sort=False).indices.items():
+            # Stable, so rows sharing a timestamp keep their file order
+            rows = rows[np.argsort(timestamps[rows], kind='stable')]
+            index[float(strike)] = (timestamps[rows], yes_prices[rows], no_prices[rows])
+        return index
     
     def _simulate_hour(self,
                       hour_start: pd.Timestamp,
                       btc_prices: pd.DataFrame,
                       markets: pd.DataFrame,
                       contract_prices: pd.DataFrame,
+                      contract_index: Dict[float, Tuple[np.ndarray, np.ndarray, np.ndarray]],
                       strategy: Strategy,
                       portfolio: Portfolio,
                       market_microstructure: MarketMicrostructure) -> Dict:
@@ -141,6 +286,25 @@ class Simulator:
         strategy.reset()
         market_microstructure.reset_hour()
         
+        hour = self._prepare_hour(hour_start, btc_prices, markets, contract_prices, contract_index)
+        if hour is None:
+            return None
+        
+        return self._trade_hour(hour, strategy, portfolio, market_microstructure,
+                                collect_dataset=self.dataset_factory is not None)
+    
+    def _prepare_hour(self,
+                      hour_start: pd.Timestamp,
+                      btc_prices: pd.DataFrame,
+                      markets: pd.DataFrame,
+                      contract_prices: pd.DataFrame,
+                      contract_index: Dict[float, Tuple[np.ndarray, np.ndarray, np.ndarray]]) -> Optional['_HourData']:
+        """
+        Select the market for an hour and gather its minute-by-minute prices.
+        
+        Returns:
+            The hour's market data, or None if hour cannot be simulated
+        """
         # Select market for this hour
         market = self.market_selector.get_market_for_hour(
             hour_start=hour_start,
@@ -157,44 +321,144 @@ class Simulator:
         strike_price = market['strike_price']
         
         # Get minute-by-minute data for this hour
-        hour_mask = (btc_prices.index >= hour_start) & (btc_prices.index < hour_end)
-        hour_btc_prices = btc_prices[hour_mask]
+        btc_index = btc_prices.index
+        hour_end_pos = None
+        if btc_index.is_monotonic_increasing:
+            start, end = btc_index.searchsorted([hour_start, hour_end])
+            hour_btc_prices = btc_prices.iloc[start:end]
+            if btc_index.is_unique:
+                # Where hour_end sits (or would sit) in the index, for the final price
+                hour_end_pos = end
+        else:
+            hour_mask = (btc_prices.index >= hour_start) & (btc_prices.index < hour_end)
+            hour_btc_prices = btc_prices[hour_mask]
         
         if hour_btc_prices.empty:
             return None
         
-        # Filter contract prices for this hour and strike
-        contract_mask = (
-            (contract_prices['timestamp'] >= hour_start) &
-            (contract_prices['timestamp'] < hour_end) &
-            (contract_prices['strike_price'] == strike_price)
+        # YES/NO prices by minute (int64 ns) for this hour and strike; rows are in
+        # time order with ties in file order, so the first row wins when a minute repeats
+        contract_by_minute = {}
+        strike_prices = contract_index.get(float(strike_price))
+        if strike_prices is not None:
+            timestamps, yes_prices, no_prices = strike_prices
+            start, end = timestamps.searchsorted([pd.Timestamp(hour_start).value, pd.Timestamp(hour_end).value])
+            for minute, yes_price, no_price in zip(timestamps[start:end].tolist(),
+                                                   yes_prices[start:end].tolist(),
+                                                   no_prices[start:end].tolist()):
+                contract_by_minute.setdefault(minute, (yes_price, no_price))
+        
+        hour_prices = hour_btc_prices['price'].to_numpy()
+        
+        # Get final BTC price at hour end
+        if hour_end_pos is not None:
+            if hour_end_pos < len(btc_index) and btc_index[hour_end_pos] == hour_end:
+                final_btc_price = btc_prices['price'].to_numpy()[hour_end_pos]
+            else:
+                # Use last available price in the hour
+                final_btc_price = hour_prices[-1]
+        elif hour_end in btc_prices.index:
+            final_btc_price = btc_prices.loc[hour_end, 'price']
+        else:
+            # Use last available price in the hour
+            final_btc_price = hour_prices[-1]
+        
+        return _HourData(
+            hour_start=hour_start,
+            hour_end=hour_end,
+            strike_price=strike_price,
+            spot_price_start=market['btc_spot_price'],
+            timestamps=hour_btc_prices.index,
+            btc_prices=hour_prices,
+            contract_by_minute=contract_by_minute,
+            final_btc_price=final_btc_price
+        )
+    
+    def _trade_hour(self,
+                    hour: '_HourData',
+                    strategy: Strategy,
+                    portfolio: Portfolio,
+                    market_microstructure: MarketMicrostructure,
+                    collect_dataset: bool = False) -> Dict:
+        """
+        Replay a prepared hour to a strategy, then resolve its positions.
+        
+        The strategy and market microstructure should already be reset for the hour.
+        
+        Returns:
+            Dictionary with hour results
+        """
+        hour_start = hour.hour_start
+        strike_price = hour.strike_price
+        dataset_factory = self.dataset_factory if collect_dataset else None
+        
+        # Vectorizable strategies decide the whole hour at once; the dataset
+        # needs every minute replayed, so collecting it takes the minute loop
+        if strategy.vectorizable and dataset_factory is None:
+            trades_executed = self._trade_minutes_vector(hour, strategy, portfolio, market_microstructure)
+        else:
+            trades_executed = self._trade_minutes(hour, strategy, portfolio, market_microstructure, dataset_factory)
+        
+        # Add labels to dataset if enabled
+        if dataset_factory is not None:
+            dataset_factory.add_labels(hour.final_btc_price, strike_price, hour_start)
+        
+        # Resolve positions
+        hour_pnl = portfolio.resolve_positions(
+            final_btc_price=hour.final_btc_price,
+            resolution_time=hour.hour_end
         )
-        hour_contract_prices = contract_prices[contract_mask]
         
-        trades_executed = []
+        return {
+            'hour_start': hour_start,
+            'hour_end': hour.hour_end,
+            'strike_price': strike_price,
+            'spot_price_start': hour.spot_price_start,
+            'final_btc_price': hour.final_btc_price,
+            'trades_executed': trades_executed,
+            'hour_pnl': hour_pnl,
+            'portfolio_value': portfolio.cash
+        }
+    
+    def _trade_minutes(self,
+                       hour: '_HourData',
+                       strategy: Strategy,
+                       portfolio: Portfolio,
+                       market_microstructure: MarketMicrostructure,
+                       dataset_factory: Optional[DatasetFactory]) -> int:
+        """
+        Feed the hour to the strategy minute by minute, executing its orders after the latency delay.
+        
+        Returns:
+            Number of trades executed
+        """
+        hour_start = hour.hour_start
+        strike_price = hour.strike_price
+        contract_by_minute = hour.contract_by_minute
+        # Bound once per hour rather than looked up every minute
+        HOLD = TradeAction.HOLD
+        on_minute = strategy.on_minute
+        decide_trade = strategy.decide_trade
+        add_pending_order = market_microstructure.add_pending_order
+        execute_ready_orders = self._execute_ready_orders
+        
+        trades_executed = 0  # Fills this hour; the records themselves are in portfolio.trade_history
         btc_history = []  # Track BTC price history for dataset features
-        pending_decisions = []  # Store decisions waiting for latency
         
         # Iterate minute-by-minute
-        for timestamp in hour_btc_prices.index:
-            # Get BTC price
-            btc_price = hour_btc_prices.loc[timestamp, 'price']
+        for timestamp, minute, btc_price in zip(hour.timestamps, hour.timestamps.asi8.tolist(), hour.btc_prices):
             btc_history.append(btc_price)
             
             # Get contract prices (YES/NO)
-            contract_data = hour_contract_prices[
-                hour_contract_prices['timestamp'] == timestamp
-            ]
-            
-            if contract_data.empty:
+            contract_data = contract_by_minute.get(minute)
+            if contract_data is None:
                 continue
             
-            yes_price = contract_data.iloc[0]['yes_price']
-            no_price = contract_data.iloc[0]['no_price']
+            yes_price, no_price = contract_data
             
             # Collect dataset if enabled
-            if self.dataset_factory is not None:
-                self.dataset_factory.collect_minute_data(
+            if dataset_factory is not None:
+                dataset_factory.collect_minute_data(
                     timestamp=timestamp,
                     btc_price=btc_price,
                     yes_price=yes_price,
@@ -205,7 +469,7 @@ class Simulator:
                 )
             
             # Feed data to strategy
-            strategy.on_minute(
+            on_minute(
                 timestamp=timestamp,
                 btc_price=btc_price,
                 yes_price=yes_price,
@@ -213,103 +477,99 @@ class Simulator:
             )
             
             # Get trade decision (this is the signal)
-            action, quantity = strategy.decide_trade(portfolio)
+            action, quantity = decide_trade(portfolio)
             
             # Store decision with latency delay
-            if action != TradeAction.HOLD and quantity:
-                pending_decisions.append({
-                    'decision_time': timestamp,
-                    'action': action,
-                    'quantity': quantity,
-                    'yes_price': yes_price,
-                    'no_price': no_price
-                })
+            if action != HOLD and quantity:
+                add_pending_order(timestamp, PENDING_ACTIONS.index(action), quantity)
             
-            # Execute trades that have passed the latency delay
-            # Filter pending decisions into executable and remaining based on latency delay
-            executable_decisions = []
-            remaining_decisions = []
-            
-            for decision in pending_decisions:
-                time_diff = (timestamp - decision['decision_time']).total_seconds() / 60
-                
-                if time_diff >= self.config.latency_minutes:
-                    executable_decisions.append(decision)
-                else:
-                    remaining_decisions.append(decision)
-            
-            # Update pending list
-            pending_decisions = remaining_decisions
-            
-            # Execute all ready trades
-            for decision in executable_decisions:
-                action = decision['action']
-                quantity = decision['quantity']
-                
-                # Use current prices (after latency), not decision prices
-                if action == TradeAction.BUY_YES:
-                    success = portfolio.buy_yes(
-                        quantity=quantity,
-                        price=yes_price,  # Current price, not decision price
-                        timestamp=timestamp,
-                        strike_price=strike_price
-                    )
-                    if success:
-                        # Get actual executed quantity from portfolio's trade history
-                        last_trade = portfolio.trade_history[-1]
-                        trades_executed.append({
-                            'timestamp': timestamp,
-                            'action': 'BUY_YES',
-                            'quantity': last_trade['quantity'],
-                            'price': last_trade['price'],
-                            'decision_time': decision['decision_time']
-                        })
-                
-                elif action == TradeAction.BUY_NO:
-                    success = portfolio.buy_no(
-                        quantity=quantity,
-                        price=no_price,  # Current price, not decision price
-                        timestamp=timestamp,
-                        strike_price=strike_price
-                    )
-                    if success:
-                        # Get actual executed quantity from portfolio's trade history
-                        last_trade = portfolio.trade_history[-1]
-                        trades_executed.append({
-                            'timestamp': timestamp,
-                            'action': 'BUY_NO',
-                            'quantity': last_trade['quantity'],
-                            'price': last_trade['price'],
-                            'decision_time': decision['decision_time']
-                        })
+            # Execute all trades that have passed the latency delay
+            trades_executed += execute_ready_orders(
+                timestamp, yes_price, no_price, strike_price, portfolio, market_microstructure)
         
-        # Get final BTC price at hour end
-        if hour_end in btc_prices.index:
-            final_btc_price = btc_prices.loc[hour_end, 'price']
-        else:
-            # Use last available price in the hour
-            final_btc_price = hour_btc_prices.iloc[-1]['price']
+        return trades_executed
+    
+    def _trade_minutes_vector(self,
+                              hour: '_HourData',
+                              strategy: Strategy,
+                              portfolio: Portfolio,
+                              market_microstructure: MarketMicrostructure) -> int:
+        """
+        Execute the orders of a vectorizable strategy, decided for the whole hour in one call.
         
-        # Add labels to dataset if enabled
-        if self.dataset_factory is not None:
-            self.dataset_factory.add_labels(final_btc_price, strike_price, hour_start)
+        Only the minutes from the first order until the queue drains are visited,
+        with the same latency and execution rules as the minute loop.
         
-        # Resolve positions
-        hour_pnl = portfolio.resolve_positions(
-            final_btc_price=final_btc_price,
-            resolution_time=hour_end
-        )
+        Returns:
+            Number of trades executed
+        """
+        positions, yes_prices, no_prices = hour.tradable_minutes()
+        actions, quantities = strategy.decide_trade_vector(
+            hour.timestamps[positions], hour.btc_prices[positions], yes_prices, no_prices, portfolio)
+        orders = np.flatnonzero((actions != TradeAction.HOLD) & (quantities != 0))
+        if not len(orders):
+            return 0
         
-        return {
-            'hour_start': hour_start,
-            'hour_end': hour_end,
-            'strike_price': strike_price,
-            'spot_price_start': market['btc_spot_price'],
-            'final_btc_price': final_btc_price,
-            'trades_executed': len(trades_executed),
-            'hour_pnl': hour_pnl,
-            'portfolio_value': portfolio.cash
-        }
+        HOLD = TradeAction.HOLD
+        strike_price = hour.strike_price
+        last_order = int(orders[-1])
+        trades_executed = 0
+        for k, position, action, quantity, yes_price, no_price in zip(
+                range(int(orders[0]), len(positions)), positions[orders[0]:].tolist(),
+                actions[orders[0]:].tolist(), quantities[orders[0]:].tolist(),
+                yes_prices[orders[0]:].tolist(), no_prices[orders[0]:].tolist()):
+            timestamp = hour.timestamps[position]
+            if action != HOLD and quantity:
+                market_microstructure.add_pending_order(timestamp, PENDING_ACTIONS.index(action), quantity)
+            
+            trades_executed += self._execute_ready_orders(
+                timestamp, yes_price, no_price, strike_price, portfolio, market_microstructure)
+            if k >= last_order and not market_microstructure.pending_order_count:
+                break
+        
+        return trades_executed
+    
+    @staticmethod
+    def _execute_ready_orders(timestamp: pd.Timestamp,
+                              yes_price: float,
+                              no_price: float,
+                              strike_price: float,
+                              portfolio: Portfolio,
+                              market_microstructure: MarketMicrostructure) -> int:
+        """
+        Execute the queued orders whose latency delay has passed at the current prices.
+        
+        Returns:
+            Number of trades executed
+        """
+        trades_executed = 0
+        BUY_YES, BUY_NO = PENDING_ACTIONS
+        _, action_codes, quantities = market_microstructure.get_executable_orders(timestamp)
+        for action_code, quantity in zip(action_codes.tolist(), quantities):
+            action = PENDING_ACTIONS[action_code]
+            
+            # Use current prices (after latency), not decision prices
+            if action == BUY_YES:
+                trade = portfolio.buy_yes(
+                    quantity=quantity,
+                    price=yes_price,  # Current price, not decision price
+                    timestamp=timestamp,
+                    strike_price=strike_price
+                )
+                if trade:
+                    trades_executed += 1
+            
+            elif action == BUY_NO:
+                trade = portfolio.buy_no(
+                    quantity=quantity,
+                    price=no_price,  # Current price, not decision price
+                    timestamp=timestamp,
+                    strike_price=strike_price
+                )
+                if trade:
+                    trades_executed += 1
+        
+        return trades_executed
     
     def save_dataset(self, output_path: str) -> None:
         """
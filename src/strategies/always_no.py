@@ -1,7 +1,8 @@
 """Always buy NO baseline strategy."""
 
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
 from .base import Strategy, TradeAction
 
 
@@ -12,6 +13,8 @@ class AlwaysNoStrategy(Strategy):
     This is a baseline strategy for counterfactual testing.
     """
     
+    vectorizable = True
+    
     def __init__(self, max_position_pct: float = 0.1):
         """
         Initialize always NO strategy.
@@ -72,3 +75,18 @@ class AlwaysNoStrategy(Strategy):
         
         # Don't set has_traded if quantity is 0 - allow retry if cash becomes available
         return TradeAction.HOLD, None
+    
+    def decide_trade_vector(self,
+                            timestamps: pd.DatetimeIndex,
+                            btc_prices: np.ndarray,
+                            yes_prices: np.ndarray,
+                            no_prices: np.ndarray,
+                            portfolio: 'Portfolio') -> Tuple[np.ndarray, np.ndarray]:
+        """Buy NO at the first minute with a whole contract affordable, as decide_trade does."""
+        actions = np.full(len(no_prices), TradeAction.HOLD, dtype=object)
+        quantities = np.zeros(len(no_prices), dtype=np.int64)
+        affordable = self._calculate_quantities(portfolio.cash, no_prices, self.max_position_pct)
+        first = np.flatnonzero(affordable > 0)[:1]
+        actions[first] = TradeAction.BUY_NO
+        quantities[first] = affordable[first]
+        return actions, quantities
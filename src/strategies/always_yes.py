@@ -1,7 +1,8 @@
 """Always buy YES baseline strategy."""
 
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
 from .base import Strategy, TradeAction
 
 
@@ -12,6 +13,8 @@ class AlwaysYesStrategy(Strategy):
     This is a baseline strategy for counterfactual testing.
     """
     
+    vectorizable = True
+    
     def __init__(self, max_position_pct: float = 0.1):
         """
         Initialize always YES strategy.
@@ -72,3 +75,18 @@ class AlwaysYesStrategy(Strategy):
         
         # Don't set has_traded if quantity is 0 - allow retry if cash becomes available
         return TradeAction.HOLD, None
+    
+    def decide_trade_vector(self,
+                            timestamps: pd.DatetimeIndex,
+                            btc_prices: np.ndarray,
+                            yes_prices: np.ndarray,
+                            no_prices: np.ndarray,
+                            portfolio: 'Portfolio') -> Tuple[np.ndarray, np.ndarray]:
+        """Buy YES at the first minute with a whole contract affordable, as decide_trade does."""
+        actions = np.full(len(yes_prices), TradeAction.HOLD, dtype=object)
+        quantities = np.zeros(len(yes_prices), dtype=np.int64)
+        affordable = self._calculate_quantities(portfolio.cash, yes_prices, self.max_position_pct)
+        first = np.flatnonzero(affordable > 0)[:1]
+        actions[first] = TradeAction.BUY_YES
+        quantities[first] = affordable[first]
+        return actions, quantities
@@ -2,7 +2,8 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Optional
+from typing import Optional, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -16,6 +17,9 @@ class TradeAction(Enum):
 class Strategy(ABC):
     """Abstract base class for trading strategies."""
     
+    # True when decide_trade_vector reproduces on_minute/decide_trade for a whole hour
+    vectorizable = False
+    
     def __init__(self, name: str):
         """
         Initialize strategy.
@@ -62,6 +66,44 @@ class Strategy(ABC):
         """
         pass
     
+    def decide_trade_vector(self,
+                            timestamps: pd.DatetimeIndex,
+                            btc_prices: np.ndarray,
+                            yes_prices: np.ndarray,
+                            no_prices: np.ndarray,
+                            portfolio: 'Portfolio') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decide trades for a whole hour at once (only used when vectorizable is True).
+        
+        Replaces the per-minute on_minute/decide_trade calls, so it is only valid
+        for strategies whose decisions never react to fills within the hour.
+        This default runs those calls minute by minute against the portfolio as
+        it stands at the start of the hour; overrides compute the same decisions
+        from the arrays and may leave self.history unpopulated.
+        
+        Args:
+            timestamps: Each minute of the hour with contract prices
+            btc_prices: BTC price for those minutes
+            yes_prices: YES contract price for those minutes
+            no_prices: NO contract price for those minutes
+            portfolio: Portfolio at the start of the hour
+            
+        Returns:
+            Tuple of (actions, quantities) per minute: an object array of
+            TradeAction members and whole numbers of contracts (0 where the
+            action is HOLD)
+        """
+        actions = np.full(len(yes_prices), TradeAction.HOLD, dtype=object)
+        quantities = np.zeros(len(yes_prices), dtype=np.int64)
+        for i, (timestamp, btc_price, yes_price, no_price) in enumerate(zip(
+                timestamps, btc_prices.tolist(), yes_prices.tolist(), no_prices.tolist())):
+            self.on_minute(timestamp=timestamp, btc_price=btc_price, yes_price=yes_price, no_price=no_price)
+            action, quantity = self.decide_trade(portfolio)
+            if action != TradeAction.HOLD and quantity:
+                actions[i] = action
+                quantities[i] = quantity
+        return actions, quantities
+    
     def get_current_prices(self) -> Optional[dict]:
         """Get the most recent price data."""
         if not self.history:
@@ -86,3 +128,21 @@ class Strategy(ABC):
         
         # Return whole number of contracts
         return int(max_quantity)
+    
+    @staticmethod
+    def _calculate_quantities(cash: float, prices: np.ndarray, max_position_pct: float) -> np.ndarray:
+        """
+        Vectorized _calculate_quantity for a fixed cash balance.
+        
+        Args:
+            cash: Portfolio cash
+            prices: Price per contract for each minute
+            max_position_pct: Maximum percentage of portfolio per trade
+            
+        Returns:
+            Whole number of contracts to buy for each minute
+        """
+        max_value = cash * max_position_pct
+        with np.errstate(divide='ignore', invalid='ignore'):
+            max_quantity = np.where(prices > 0, max_value / prices, 0.0)
+        return np.trunc(max_quantity).astype(np.int64)
@@ -1,7 +1,8 @@
 """No-trade baseline strategy."""
 
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
 from .base import Strategy, TradeAction
 
 
@@ -12,6 +13,8 @@ class NoTradeStrategy(Strategy):
     Serves as a baseline for comparison.
     """
     
+    vectorizable = True
+    
     def __init__(self):
         """Initialize no-trade strategy."""
         super().__init__(name="NoTrade")
@@ -37,3 +40,13 @@ class NoTradeStrategy(Strategy):
             (HOLD, None) always
         """
         return TradeAction.HOLD, None
+    
+    def decide_trade_vector(self,
+                            timestamps: pd.DatetimeIndex,
+                            btc_prices: np.ndarray,
+                            yes_prices: np.ndarray,
+                            no_prices: np.ndarray,
+                            portfolio: 'Portfolio') -> Tuple[np.ndarray, np.ndarray]:
+        """Hold on every minute."""
+        return (np.full(len(yes_prices), TradeAction.HOLD, dtype=object),
+                np.zeros(len(yes_prices), dtype=np.int64))
@@ -0,0 +1,34 @@
+"""Integer-nanosecond time helpers shared by the vectorized code paths.
+
+Timestamps are compared and bucketed as int64 nanoseconds since the epoch
+(UTC for timezone-aware values), the representation behind pandas'
+datetime64[ns] columns.
+"""
+
+import numpy as np
+import pandas as pd
+
+NAT_NS = pd.NaT.value  # int64 representation of NaT
+MINUTE_NS = 60_000_000_000  # One minute in int64 nanoseconds
+HOUR_NS = 60 * MINUTE_NS  # One hour in int64 nanoseconds
+
+
+def datetime_ns(values, errors: str = 'raise') -> np.ndarray:
+    """
+    Timestamps as int64 nanoseconds (NaT as NAT_NS).
+    
+    Values that are already datetime64 skip pd.to_datetime's type inference.
+    
+    Args:
+        values: Sequence of timestamps (or anything pd.to_datetime parses)
+        errors: Passed to pd.to_datetime; 'coerce' turns unparseable values into NaT
+        
+    Returns:
+        int64 array with one entry per value
+    """
+    series = pd.Series(values)
+    if not pd.api.types.is_datetime64_any_dtype(series.dtype):
+        series = pd.to_datetime(series, errors=errors)
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+    return series.to_numpy(dtype='datetime64[ns]').view('i8')
@@ -3,7 +3,7 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 
 from src.metrics import MetricsCalculator
@@ -17,7 +17,8 @@ class StrategyVisualizer:
     @staticmethod
     def create_alpha_comparison_charts(all_results: List[Dict], 
                                        baseline_name: str = "NoTrade",
-                                       output_dir: str = "output") -> None:
+                                       output_dir: str = "output",
+                                       metrics_list: Optional[List[Dict]] = None) -> None:
         """
         Create comprehensive alpha comparison charts.
         
@@ -25,15 +26,18 @@ class StrategyVisualizer:
             all_results: List of results dictionaries from multiple strategies
             baseline_name: Name of the baseline strategy for alpha calculation
             output_dir: Directory to save charts
+            metrics_list: Metrics already calculated for all_results, in the
+                same order (default: calculated here)
         """
         # Create output directory if it doesn't exist
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
         # Calculate metrics for all strategies
-        metrics_list = []
-        for result in all_results:
-            metrics = MetricsCalculator.calculate_metrics(result)
-            metrics_list.append(metrics)
+        if metrics_list is None:
+            metrics_list = []
+            for result in all_results:
+                metrics = MetricsCalculator.calculate_metrics(result)
+                metrics_list.append(metrics)
         
         df = pd.DataFrame(metrics_list)
         
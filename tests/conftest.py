@@ -0,0 +1,43 @@
+"""Shared fixtures for the test suite."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio import Portfolio
+
+
+def _resolved_portfolio(n_trades: int, seed: int = 0) -> Portfolio:
+    """Portfolio whose pnl_history holds n_trades random resolved positions."""
+    rng = np.random.default_rng(seed)
+    portfolio = Portfolio(starting_balance=10_000.0)
+    
+    hours = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 24 * 90, n_trades), unit='h')
+    entries = list(hours + pd.to_timedelta(rng.integers(0, 59, n_trades), unit='min'))
+    exits = list(hours + pd.Timedelta(hours=1))
+    if n_trades:
+        entries[0] = pd.NaT  # One trade without an entry time
+    
+    is_yes = rng.random(n_trades) < 0.5
+    quantity = rng.integers(1, 200, n_trades).astype(np.float64)
+    entry_price = rng.uniform(0.02, 0.98, n_trades)
+    strike = 42_000 + 250.0 * rng.integers(-4, 5, n_trades)
+    final_btc = strike + rng.normal(0, 400, n_trades)
+    wins = np.where(is_yes, final_btc >= strike, final_btc < strike)
+    payout = np.where(wins, quantity, 0.0)
+    pnl = payout - quantity * entry_price
+    pnl[::97] = 0.0  # Some break-even trades
+    
+    portfolio.pnl_history.extend(
+        exits, entries, exits, entries,
+        np.where(is_yes, 'YES', 'NO').tolist(),
+        quantity, entry_price, payout, pnl, strike, final_btc,
+        wins.tolist(),
+    )
+    return portfolio
+
+
+@pytest.fixture
+def make_resolved_portfolio():
+    """Factory for portfolios with random resolved trades: make(n_trades, seed=0)."""
+    return _resolved_portfolio
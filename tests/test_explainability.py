@@ -0,0 +1,87 @@
+"""Tests for the explainability engine's numeric helpers."""
+
+import numpy as np
+import pytest
+
+from src.explainability import (
+    EPSILON,
+    JIT_MIN_TRADES,
+    ExplainabilityEngine,
+    _classify_all,
+    _classify_all_numpy,
+    _pearson_correlation,
+)
+from src.portfolio import PNL_COLUMNS, RecordHistory
+
+
+def test_pearson_matches_corrcoef():
+    rng = np.random.default_rng(0)
+    for n in (2, 3, 10, 1_000):
+        x = rng.normal(1.7e18, 1e12, n)  # Entry times in ns
+        y = rng.normal(0, 150, n) + 1e-10 * (x - x.mean())
+        assert np.isclose(_pearson_correlation(x, y), np.corrcoef(x, y)[0, 1], rtol=1e-10, atol=1e-12)
+
+
+def test_pearson_is_clipped():
+    x = np.linspace(0, 1, 50) * 1e9
+    assert _pearson_correlation(x, 3 * x + 2) == 1.0
+    assert _pearson_correlation(x, -x) == -1.0
+
+
+def test_pearson_near_constant_inputs():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=100)
+    flat = 5.0 + rng.normal(scale=np.sqrt(EPSILON) / 10, size=100)
+    
+    assert _pearson_correlation(x, np.full(100, 5.0)) == 0.0
+    assert _pearson_correlation(flat, x) == 0.0
+    assert _pearson_correlation(x, flat) == 0.0
+    assert _pearson_correlation(x[:0], x[:0]) == 0.0
+
+
+@pytest.mark.parametrize('size', [1, JIT_MIN_TRADES - 1, JIT_MIN_TRADES])
+def test_classify_all_on_both_sides_of_jit_threshold(size):
+    rng = np.random.default_rng(size)
+    entry_price = rng.uniform(0.01, 0.99, size)
+    is_yes = rng.random(size) < 0.5
+    strike = 42_000 + 250.0 * rng.integers(-4, 5, size)
+    final_btc = strike + rng.normal(0, 400, size)
+    final_btc[::11] = strike[::11]  # Exactly at the strike
+    
+    expected = _classify_all_numpy(entry_price, is_yes, final_btc, strike)
+    np.testing.assert_array_equal(_classify_all(entry_price, is_yes, final_btc, strike), expected)
+    np.testing.assert_array_equal(_classify_all(entry_price, is_yes),
+                                  _classify_all_numpy(entry_price, is_yes, None, None))
+
+
+@pytest.mark.parametrize('size', [50, JIT_MIN_TRADES - 1, JIT_MIN_TRADES])
+def test_fused_importance_matches_vectorized(make_resolved_portfolio, size):
+    engine = ExplainabilityEngine()
+    engine._sync_cache(make_resolved_portfolio(size, seed=size))
+    
+    fused = engine._importance_fused()
+    vectorized = engine._importance_vectorized()
+    
+    assert fused.keys() == vectorized.keys()
+    for name, value in vectorized.items():
+        assert fused[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+
+def test_sync_cache_appends_only_new_trades(make_resolved_portfolio):
+    portfolio = make_resolved_portfolio(300)
+    history = portfolio.pnl_history
+    full = make_resolved_portfolio(300)
+    
+    engine = ExplainabilityEngine()
+    # Sync a prefix first, then the rest, as the simulator does hour by hour
+    prefix = RecordHistory(PNL_COLUMNS)
+    prefix.extend(*(history.column(name)[:120] for name in history.columns))
+    portfolio.pnl_history = prefix
+    engine._sync_cache(portfolio)
+    prefix.extend(*(history.column(name)[120:] for name in history.columns))
+    engine._sync_cache(portfolio)
+    
+    reference = ExplainabilityEngine()
+    reference._sync_cache(full)
+    for name, values in reference._cache.items():
+        np.testing.assert_array_equal(engine._cache[name], values, err_msg=name)
@@ -0,0 +1,68 @@
+"""Tests for pricing and per-minute liquidity tracking in the microstructure model."""
+
+import pandas as pd
+import pytest
+
+from src.market_microstructure import MarketMicrostructure
+
+
+def test_liquidity_is_tracked_per_minute():
+    mm = MarketMicrostructure(max_liquidity_per_minute=100.0)
+    t = pd.Timestamp('2024-01-01 10:05')
+    
+    assert mm.execute_trade(t, 0.5, 60.0).quantity_executed == 60.0
+    partial = mm.execute_trade(t, 0.5, 60.0)
+    assert partial.executed and partial.quantity_executed == 40.0
+    assert not mm.execute_trade(t, 0.5, 1.0).executed
+    
+    # The next minute has its own budget
+    assert mm.check_liquidity(t + pd.Timedelta(minutes=1), 100.0) == (True, 100.0)
+    assert mm.liquidity_consumed == {t: 100.0}
+    
+    mm.rollback_liquidity(t, 30.0)
+    assert mm.liquidity_consumed == {t: 70.0}
+
+
+def test_same_minute_of_another_hour_does_not_share_liquidity():
+    mm = MarketMicrostructure(max_liquidity_per_minute=100.0)
+    t = pd.Timestamp('2024-01-01 10:05')
+    mm.consume_liquidity(t, 100.0)
+    
+    # No reset_hour call in between: the slots still must not carry over
+    later = t + pd.Timedelta(hours=1)
+    assert mm.check_liquidity(later, 50.0) == (True, 50.0)
+    assert mm.liquidity_consumed == {}
+    
+    mm.consume_liquidity(later, 50.0)
+    assert mm.liquidity_consumed == {later: 50.0}
+    
+    mm.reset_hour()
+    assert mm.liquidity_consumed == {}
+
+
+def test_quote_does_not_consume():
+    mm = MarketMicrostructure(max_liquidity_per_minute=100.0)
+    t = pd.Timestamp('2024-01-01 10:05', tz='UTC')
+    
+    quote = mm.quote_trade(t, 0.5, 150.0)
+    assert quote.quantity_executed == 100.0
+    assert mm.liquidity_consumed == {}
+    
+    mm.consume_liquidity(t, quote.quantity_executed)
+    assert mm.liquidity_consumed == {t: 100.0}
+
+
+def test_execution_price_by_side():
+    mm = MarketMicrostructure(bid_ask_spread=0.02, slippage_per_100_contracts=0.01)
+    t = pd.Timestamp('2024-01-01 10:05')
+    
+    assert mm.get_execution_price(0.5, 100, 'buy') == pytest.approx((0.52, 0.01, 0.01))
+    assert mm.get_execution_price(0.5, 100, 'sell') == pytest.approx((0.48, 0.01, 0.01))
+    # Clipped prices report the slippage actually incurred
+    assert mm.get_execution_price(0.975, 100, 'buy') == pytest.approx((0.99, 0.01, 0.005))
+    assert mm.quote_trade(t, 0.5, 100, 'sell').execution_price == pytest.approx(0.48)
+    
+    with pytest.raises(ValueError):
+        mm.get_execution_price(0.5, 100, 'BUY')
+    with pytest.raises(ValueError):
+        mm.execute_trade(t, 0.5, 100, side='short')
@@ -0,0 +1,111 @@
+"""Tests for the market selector's metric kernels."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.market_selector import JIT_MIN_TICKS, MarketSelector, _change_correlation
+
+
+def _reference_reaction(a, b):
+    da, db = np.diff(a), np.diff(b)
+    valid = ~(np.isnan(da) | np.isnan(db))
+    if valid.sum() < 2 or np.std(da[valid]) == 0 or np.std(db[valid]) == 0:
+        return 0.0
+    return abs(np.corrcoef(da[valid], db[valid])[0, 1])
+
+
+def test_change_correlation_matches_corrcoef():
+    rng = np.random.default_rng(0)
+    for n in (2, 3, 5, 60, 500):
+        a = 42_000 + np.cumsum(rng.normal(0, 25, n))
+        b = np.clip(0.5 + np.cumsum(rng.normal(0, 0.01, n)), 0.01, 0.99)
+        a[rng.random(n) < 0.1] = np.nan
+        assert np.isclose(_change_correlation(a, b), _reference_reaction(a, b), rtol=1e-12, atol=1e-12)
+
+
+def test_change_correlation_degenerate_inputs():
+    rng = np.random.default_rng(1)
+    moving = rng.normal(size=30).cumsum()
+    
+    assert _change_correlation(np.full(30, 0.5), moving) == 0.0
+    assert _change_correlation(moving, np.full(30, 0.5)) == 0.0
+    assert _change_correlation(moving[:2], moving[:2]) == 0.0
+    assert _change_correlation(moving, moving) == 1.0
+    assert _change_correlation(moving, -moving) == 1.0
+
+
+def _prices(minutes=30, seed=2):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2024-01-01 10:00', periods=minutes, freq='min')
+    btc = pd.DataFrame({'price': 42_000 + np.cumsum(rng.normal(0, 25, minutes))}, index=times)
+    yes = np.clip(0.5 + np.cumsum(rng.normal(0, 0.01, minutes)), 0.01, 0.99)
+    contracts = pd.DataFrame({
+        'timestamp': times,
+        'strike_price': 42_000.0,
+        'yes_price': yes,
+        'no_price': 1.0 - yes,
+    })
+    return contracts, btc
+
+
+def _reaction(contracts, btc):
+    selector = MarketSelector()
+    metrics = selector._calculate_hour_metrics(
+        pd.Timestamp('2024-01-01 10:00'), [42_000.0], contracts, btc)
+    return metrics[42_000.0]['price_reaction']
+
+
+def test_price_reaction_ignores_row_order_and_duplicates():
+    contracts, btc = _prices()
+    expected = _reaction(contracts, btc)
+    assert 0.0 < expected <= 1.0
+    
+    # Shuffled rows, plus duplicated timestamps after the first occurrence
+    shuffled = contracts.sample(frac=1.0, random_state=3)
+    duplicated = pd.concat([shuffled, contracts.iloc[::5].assign(yes_price=0.99)])
+    btc_shuffled = pd.concat([btc.sample(frac=1.0, random_state=4), btc.iloc[::7] * 2])
+    
+    assert np.isclose(_reaction(duplicated, btc_shuffled), expected, rtol=1e-12)
+
+
+def test_price_reaction_is_zero_across_timezone_awareness():
+    contracts, btc = _prices()
+    btc.index = btc.index.tz_localize('UTC')
+    
+    assert _reaction(contracts, btc) == 0.0
+
+
+def _market_data(hours, strikes=9, seed=5):
+    rng = np.random.default_rng(seed)
+    minutes = pd.date_range('2024-01-01', periods=60 * hours, freq='min')
+    btc = pd.DataFrame({'price': 42_000 + np.cumsum(rng.normal(0, 25, len(minutes)))}, index=minutes)
+    
+    times = np.repeat(minutes.values, strikes)
+    strike_prices = np.tile(42_000 + 250.0 * np.arange(-(strikes // 2), strikes - strikes // 2), len(minutes))
+    yes = rng.uniform(0.01, 0.99, len(times))
+    no = 1.0 - yes + rng.normal(0, 0.01, len(times))
+    yes[rng.random(len(times)) < 0.01] = np.nan
+    contracts = pd.DataFrame({'timestamp': times, 'strike_price': strike_prices, 'yes_price': yes, 'no_price': no})
+    return contracts, btc
+
+
+@pytest.mark.parametrize('hours', [3, 190])
+def test_precomputed_metrics_match_per_hour_metrics(hours):
+    contracts, btc = _market_data(hours)
+    # 3 hours stay on the NumPy path, 190 hours cross JIT_MIN_TICKS
+    assert (len(contracts) >= JIT_MIN_TICKS) == (hours == 190)
+    
+    precomputed = MarketSelector()
+    precomputed.precompute_metrics(contracts, btc)
+    
+    per_hour = MarketSelector()
+    strikes = sorted(contracts['strike_price'].unique().tolist())
+    for hour_start in pd.date_range('2024-01-01', periods=hours, freq='h'):
+        expected = per_hour._calculate_hour_metrics(hour_start, strikes, contracts, btc)
+        for strike in strikes:
+            cached = precomputed._metrics_cache[(hour_start.value, strike)]
+            assert cached['price_reaction'] == expected[strike]['price_reaction']
+            # The compiled pass sums sequentially, so only the last bits may differ
+            for name in ('avg_spread', 'volume_proxy'):
+                assert cached[name] == pytest.approx(expected[strike][name], rel=1e-12), name
@@ -0,0 +1,79 @@
+"""Tests that the metrics fast paths agree with their plain NumPy counterparts."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.metrics as metrics
+from src.metrics import MetricsCalculator, _pnl_stats
+
+
+def _reference_pnl_stats(pnl):
+    return ((pnl > 0).sum(), (pnl < 0).sum(), pnl.sum(), pnl[pnl > 0].sum(), pnl[pnl < 0].sum())
+
+
+@pytest.mark.parametrize('size', [0, 1, metrics.JIT_MIN_TRADES - 1, metrics.JIT_MIN_TRADES, 3 * metrics.JIT_MIN_TRADES])
+def test_pnl_stats_on_both_sides_of_jit_threshold(size):
+    rng = np.random.default_rng(size)
+    pnl = np.round(rng.normal(0, 50, size), 2)
+    pnl[::13] = 0.0
+    
+    wins, losses, total_sum, win_sum, loss_sum = _pnl_stats(pnl)
+    ref_wins, ref_losses, ref_total, ref_win_sum, ref_loss_sum = _reference_pnl_stats(pnl)
+    
+    assert (wins, losses) == (ref_wins, ref_losses)
+    # The compiled pass sums sequentially, so only the last bits may differ
+    np.testing.assert_allclose([total_sum, win_sum, loss_sum], [ref_total, ref_win_sum, ref_loss_sum],
+                               rtol=1e-9, atol=1e-6)
+
+
+def _results(portfolio, name):
+    values = 10_000.0 + np.cumsum(portfolio.pnl_array()[:50])
+    return {
+        'strategy_name': name,
+        'total_pnl': float(portfolio.pnl_array().sum()),
+        'final_balance': 10_000.0 + float(portfolio.pnl_array().sum()),
+        'initial_balance': 10_000.0,
+        'hours_traded': [{'portfolio_value': value} for value in values.tolist()],
+        'portfolio': portfolio,
+    }
+
+
+def test_metrics_match_reference(make_resolved_portfolio):
+    portfolio = make_resolved_portfolio(500)
+    result = MetricsCalculator.calculate_metrics(_results(portfolio, 'Synthetic'))
+    
+    frame = pd.DataFrame(portfolio.pnl_history)
+    pnl = frame['pnl']
+    assert result['total_trades'] == len(frame)
+    assert result['wins'] == (pnl > 0).sum()
+    assert result['avg_trade_pnl'] == pytest.approx(pnl.mean())
+    assert result['avg_loss'] == pytest.approx(pnl[pnl < 0].mean())
+    durations = (pd.to_datetime(frame['exit_timestamp']) - pd.to_datetime(frame['entry_timestamp']))
+    assert result['avg_trade_duration_minutes'] == pytest.approx(durations.dt.total_seconds().mean() / 60)
+    
+    equity = np.concatenate(([10_000.0], [hour['portfolio_value'] for hour in _results(portfolio, '')['hours_traded']]))
+    running_max = np.maximum.accumulate(equity)
+    assert result['max_drawdown'] == pytest.approx(abs(((equity - running_max) / running_max * 100).min()))
+
+
+def test_parallel_metrics_match_serial(make_resolved_portfolio, monkeypatch):
+    all_results = [_results(make_resolved_portfolio(n, seed), f'S{seed}')
+                   for seed, n in enumerate((300, 0, 1_000))]
+    serial = MetricsCalculator._calculate_all_metrics(all_results)
+    
+    # Cross PARALLEL_MIN_TRADES and make sure the pool is really used
+    pools = []
+    
+    class RecordingPool(metrics.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+    
+    monkeypatch.setattr(metrics, 'PARALLEL_MIN_TRADES', 1)
+    monkeypatch.setattr(metrics, 'ProcessPoolExecutor', RecordingPool)
+    monkeypatch.setattr(metrics.os, 'cpu_count', lambda: 2)
+    parallel = MetricsCalculator._calculate_all_metrics(all_results)
+    
+    assert len(pools) == 1
+    pd.testing.assert_frame_equal(pd.DataFrame(parallel), pd.DataFrame(serial))
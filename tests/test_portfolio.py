@@ -0,0 +1,90 @@
+"""Tests for the columnar trade record history."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio import RecordHistory
+
+
+COLUMNS = (
+    ('timestamp', None),
+    ('contract_type', None),
+    ('quantity', 'd'),
+    ('pnl', 'd'),
+)
+
+
+def _history():
+    history = RecordHistory(COLUMNS)
+    history.append(pd.Timestamp('2024-01-01 00:05'), 'YES', 10.0, 1.5)
+    history.append({
+        'timestamp': pd.Timestamp('2024-01-01 00:10'),
+        'contract_type': 'NO',
+        'quantity': 4.0,
+        'pnl': -0.5,
+    })
+    return history
+
+
+def test_append_accepts_values_and_dicts():
+    history = _history()
+    
+    assert len(history) == 2
+    assert history[0] == {
+        'timestamp': pd.Timestamp('2024-01-01 00:05'),
+        'contract_type': 'YES',
+        'quantity': 10.0,
+        'pnl': 1.5,
+    }
+    assert history[-1]['contract_type'] == 'NO'
+    assert [record['pnl'] for record in history] == [1.5, -0.5]
+
+
+def test_append_rejects_wrong_arity():
+    history = RecordHistory(COLUMNS)
+    
+    with pytest.raises(TypeError):
+        history.append('YES', 10.0)
+    with pytest.raises(KeyError):
+        history.append({'timestamp': pd.Timestamp('2024-01-01'), 'quantity': 1.0})
+    assert len(history) == 0
+
+
+def test_extend_and_slicing():
+    history = _history()
+    history.extend(
+        [pd.Timestamp('2024-01-01 00:15'), pd.Timestamp('2024-01-01 00:20')],
+        ['YES', 'YES'],
+        [1.0, 2.0],
+        [0.25, 0.75],
+    )
+    
+    assert len(history) == 4
+    assert [record['quantity'] for record in history[1:3]] == [4.0, 1.0]
+    assert list(history.column('contract_type')) == ['YES', 'NO', 'YES', 'YES']
+    np.testing.assert_array_equal(history.array('pnl'), [1.5, -0.5, 0.25, 0.75])
+    np.testing.assert_array_equal(history.array('pnl', start=2), [0.25, 0.75])
+    
+    with pytest.raises(TypeError):
+        history.extend([1.0], [2.0])
+
+
+def test_array_is_a_copy():
+    history = _history()
+    pnl = history.array('pnl')
+    
+    # Growing the history must still work while the caller holds the array
+    history.append(pd.Timestamp('2024-01-01 00:30'), 'YES', 1.0, 2.0)
+    pnl[0] = 99.0
+    
+    assert history[0]['pnl'] == 1.5
+    assert len(history) == 3
+
+
+def test_dataframe_views_match():
+    history = _history()
+    
+    expected = pd.DataFrame([dict(record) for record in history])
+    pd.testing.assert_frame_equal(pd.DataFrame(history), expected)
+    pd.testing.assert_frame_equal(history.to_frame(), expected)
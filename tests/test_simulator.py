@@ -0,0 +1,71 @@
+"""Tests that the simulator's shared and vectorized paths match plain run() calls."""
+
+from pathlib import Path
+
+import pytest
+
+from src.config import SimulationConfig
+from src.simulator import Simulator
+from src.strategies.always_no import AlwaysNoStrategy
+from src.strategies.always_yes import AlwaysYesStrategy
+from src.strategies.mean_reversion import MeanReversionStrategy
+from src.strategies.momentum import MomentumStrategy
+from src.strategies.no_trade import NoTradeStrategy
+from src.strategies.random_trade import RandomStrategy
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    # The market selection log is written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return SimulationConfig(
+        latency_minutes=2,
+        btc_prices_path=str(DATA_DIR / 'btc_prices_minute.csv'),
+        markets_path=str(DATA_DIR / 'kalshi_markets.csv'),
+        contract_prices_path=str(DATA_DIR / 'kalshi_contract_prices.csv'),
+    )
+
+
+def _strategies():
+    return [
+        MomentumStrategy(lookback_minutes=3, max_position_pct=0.1),
+        MeanReversionStrategy(window_minutes=10, threshold=0.05, max_position_pct=0.1),
+        RandomStrategy(max_position_pct=0.1, seed=42),
+        AlwaysYesStrategy(max_position_pct=0.1),
+        AlwaysNoStrategy(max_position_pct=0.1),
+        NoTradeStrategy(),
+    ]
+
+
+def _assert_same_results(actual, expected):
+    assert actual['strategy_name'] == expected['strategy_name']
+    assert actual['final_balance'] == expected['final_balance']
+    assert actual['total_pnl'] == expected['total_pnl']
+    assert actual['max_drawdown'] == expected['max_drawdown']
+    assert actual['hours_traded'] == expected['hours_traded']
+    assert list(actual['portfolio'].trade_history) == list(expected['portfolio'].trade_history)
+    assert list(actual['portfolio'].pnl_history) == list(expected['portfolio'].pnl_history)
+
+
+def test_run_many_matches_repeated_run(config):
+    expected = [Simulator(config).run(strategy) for strategy in _strategies()]
+    actual = Simulator(config).run_many(_strategies())
+    
+    assert len(actual) == len(expected)
+    assert any(len(result['portfolio'].trade_history) for result in expected)
+    for got, want in zip(actual, expected):
+        _assert_same_results(got, want)
+
+
+@pytest.mark.parametrize('strategy_class', [AlwaysYesStrategy, AlwaysNoStrategy, NoTradeStrategy])
+def test_vector_path_matches_minute_loop(config, strategy_class):
+    class MinuteByMinute(strategy_class):
+        vectorizable = False
+    
+    kwargs = {} if strategy_class is NoTradeStrategy else {'max_position_pct': 0.1}
+    vector = Simulator(config).run(strategy_class(**kwargs))
+    looped = Simulator(config).run(MinuteByMinute(**kwargs))
+    
+    _assert_same_results(vector, looped)
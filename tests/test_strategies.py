@@ -0,0 +1,41 @@
+"""Tests that vectorized strategy decisions match the minute-by-minute ones."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio import Portfolio
+from src.strategies.always_no import AlwaysNoStrategy
+from src.strategies.always_yes import AlwaysYesStrategy
+from src.strategies.base import Strategy, TradeAction
+from src.strategies.no_trade import NoTradeStrategy
+
+
+def _hour(rng, minutes=60):
+    timestamps = pd.date_range('2024-01-01 10:00', periods=minutes, freq='min')
+    btc_prices = 42_000 + np.cumsum(rng.normal(0, 20, minutes))
+    yes_prices = rng.uniform(0.01, 0.99, minutes)
+    return timestamps, btc_prices, yes_prices, 1.0 - yes_prices
+
+
+@pytest.mark.parametrize('make_strategy', [
+    lambda: AlwaysYesStrategy(max_position_pct=0.1),
+    lambda: AlwaysNoStrategy(max_position_pct=0.1),
+    NoTradeStrategy,
+])
+@pytest.mark.parametrize('cash', [10_000.0, 1.0, 0.05])
+def test_vector_decisions_match_minute_loop(make_strategy, cash):
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        hour = _hour(rng, minutes=int(rng.integers(1, 61)))
+        vector, scalar = make_strategy(), make_strategy()
+        assert vector.vectorizable
+        
+        actions, quantities = vector.decide_trade_vector(*hour, Portfolio(starting_balance=cash))
+        # The base implementation loops on_minute/decide_trade
+        expected_actions, expected_quantities = Strategy.decide_trade_vector(
+            scalar, *hour, Portfolio(starting_balance=cash))
+        
+        assert actions.tolist() == expected_actions.tolist()
+        np.testing.assert_array_equal(quantities, expected_quantities)
+        assert all(isinstance(action, TradeAction) for action in actions)